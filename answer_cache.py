@@ -0,0 +1,183 @@
+import pickle
+import sqlite3
+import hashlib
+import inspect
+import functools
+from time import time
+
+# the cache is opt-in, cached solvers are called directly while it is disabled
+ENABLED = False
+DATABASE = "answer_cache.sqlite"
+# least recently used answers are evicted once their total size exceeds this
+MAX_BYTES = 64 * 2**20
+
+# connection of this process, opened on first use
+connection = None
+
+
+def enable(enabled: bool = True, database: str = None,
+           max_bytes: int = None) -> None:
+    """
+    Turns the answer cache on, or off if enabled=False.
+    Optionally changes the database file and the maximum cache size.
+    """
+    global ENABLED, DATABASE, MAX_BYTES, connection
+    ENABLED = enabled
+    if database is not None and database != DATABASE:
+        DATABASE = database
+        if connection is not None:
+            connection.close()
+            connection = None
+    if max_bytes is not None:
+        MAX_BYTES = max_bytes
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Returns the connection to the cache database, creating the table the
+    first time.
+    """
+    global connection
+    if connection is None:
+        connection = sqlite3.connect(DATABASE, timeout=30)
+        columns = [row[1] for row in
+                   connection.execute("PRAGMA table_info(answers)")]
+        # answers cached before the key included the year and source hash
+        # cannot be told apart from stale ones
+        if columns and "source_hash" not in columns:
+            connection.execute("DROP TABLE answers")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "day INTEGER, year INTEGER, solver TEXT, source_hash TEXT, "
+            "params TEXT, input_hash TEXT, "
+            "answer BLOB, size INTEGER, last_used REAL, PRIMARY KEY "
+            "(day, year, solver, source_hash, params, input_hash))")
+        connection.commit()
+    return connection
+
+
+def hash_input(*values) -> str:
+    """
+    Returns a hash of the values. Numpy arrays are hashed by their dtype,
+    shape and raw bytes, everything else by its pickle.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        if type(value).__module__.startswith("numpy") and \
+                hasattr(value, "shape"):
+            digest.update(f"{value.dtype.str}{value.shape}".encode())
+            digest.update(value.tobytes())
+        else:
+            digest.update(pickle.dumps(value))
+    return digest.hexdigest()
+
+
+def source_hash(solver) -> str:
+    """
+    Returns a hash of the source of the solver's module, so that answers are
+    recomputed once the solver or any helper in its module changes.
+    Falls back to the solver's bytecode if the source is unavailable.
+    """
+    try:
+        source = inspect.getsource(inspect.getmodule(solver)).encode()
+    except (OSError, TypeError):
+        source = solver.__code__.co_code
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+def lookup(day: int, year: int, solver: str, source_hash: str, params: str,
+           input_hash: str):
+    """
+    Returns a tuple (True, answer) if the answer is cached, marking it as
+    recently used, otherwise (False, None).
+    """
+    key = (day, year, solver, source_hash, params, input_hash)
+    where = "day = ? AND year = ? AND solver = ? AND source_hash = ? " \
+        "AND params = ? AND input_hash = ?"
+    db = get_connection()
+    row = db.execute(f"SELECT answer FROM answers WHERE {where}",
+                     key).fetchone()
+    if row is None:
+        return False, None
+    db.execute(f"UPDATE answers SET last_used = ? WHERE {where}",
+               (time(), *key))
+    db.commit()
+    return True, pickle.loads(row[0])
+
+
+def store(day: int, year: int, solver: str, source_hash: str, params: str,
+          input_hash: str, answer) -> None:
+    """
+    Caches the answer, then evicts the least recently used answers until the
+    cache fits within MAX_BYTES.
+    """
+    db = get_connection()
+    blob = pickle.dumps(answer)
+    db.execute("INSERT OR REPLACE INTO answers "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+               (day, year, solver, source_hash, params, input_hash, blob,
+                len(blob), time()))
+    total_size = db.execute("SELECT SUM(size) FROM answers").fetchone()[0]
+    if total_size > MAX_BYTES:
+        rows = db.execute(
+            "SELECT rowid, size FROM answers ORDER BY last_used").fetchall()
+        evicted = []
+        for rowid, size in rows:
+            if total_size <= MAX_BYTES:
+                break
+            evicted.append((rowid,))
+            total_size -= size
+        db.executemany("DELETE FROM answers WHERE rowid = ?", evicted)
+    db.commit()
+
+
+def cached(day: int, year: int, params: tuple = ()):
+    """
+    Decorator that consults the answer cache before calling the solver.
+    Answers are keyed by the day and year, the solver's name, a hash of the
+    source of its module, the arguments named in params (eg the number of
+    steps) and a hash of all the other arguments (the input data).
+
+    Parameters
+    ----------
+    day : int
+        Day of the solver.
+    year : int
+        Year of the solver.
+    params : tuple, optional
+        Names of the solver's parameters that are stored as part of the key
+        rather than hashed. The default is ().
+
+    Returns
+    -------
+    function
+        The decorator.
+
+    """
+    def decorator(solver):
+        signature = inspect.signature(solver)
+        # hashed on first use, so that importing a solver reads no files
+        solver_hash = functools.lru_cache(maxsize=None)(
+            lambda: source_hash(solver))
+
+        @functools.wraps(solver)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return solver(*args, **kwargs)
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            key_params = repr({name: arguments.arguments[name]
+                               for name in params})
+            input_hash = hash_input(
+                *(value for name, value in arguments.arguments.items()
+                  if name not in params))
+            key = (day, year, solver.__qualname__, solver_hash(), key_params,
+                   input_hash)
+
+            found, answer = lookup(*key)
+            if not found:
+                answer = solver(*args, **kwargs)
+                store(*key, answer)
+            return answer
+        return wrapper
+    return decorator
@@ -0,0 +1,107 @@
+import os
+import glob
+import json
+import argparse
+import importlib
+from time import perf_counter
+from multiprocessing import Pool
+
+# day module of each worker process, imported once by load_module() so that
+# it is shared by every input the worker solves
+module = None
+
+
+def load_module(module_name: str) -> None:
+    """
+    Imports the day module for the worker process. Used as the pool
+    initializer.
+    """
+    global module
+    module = importlib.import_module(module_name)
+
+
+def solve_input(filename: str) -> dict:
+    """
+    Parses the input file and solves both parts with the worker's day module,
+    timing every phase. Errors are recorded instead of raised so that one bad
+    input does not stop the batch.
+    """
+    result = {"input": filename, "answers": {}, "timings": {}}
+    try:
+        start_time = perf_counter()
+        with open(filename, "r") as f:
+            data = module.parse(f.read())
+        result["timings"]["parse"] = perf_counter() - start_time
+
+        for part in (1, 2):
+            start_time = perf_counter()
+            answer = getattr(module, f"part{part}")(data)
+            result["timings"][f"part{part}"] = perf_counter() - start_time
+            result["answers"][part] = answer
+    except Exception as e:
+        result["error"] = repr(e)
+    return result
+
+
+def solve_batch(day: int, filenames: list, output: str,
+                workers: int = None, chunksize: int = 1) -> int:
+    """
+    Solves many inputs of the same day across a pool of worker processes and
+    writes the results to a single file.
+
+    Parameters
+    ----------
+    day : int
+        Day of the solver to use.
+    filenames : list
+        Input files to solve.
+    output : str
+        File the results are written to, one json object per line, in the
+        order the inputs finish.
+    workers : int, optional
+        Number of worker processes. The default is None, one per core.
+    chunksize : int, optional
+        Number of inputs sent to a worker at a time, larger chunks reduce
+        overhead for many small inputs. The default is 1.
+
+    Returns
+    -------
+    int
+        Number of inputs that failed.
+
+    """
+    failures = 0
+    with Pool(workers, initializer=load_module,
+              initargs=(f"day{day:02d}",)) as pool, \
+            open(output, "w") as f:
+        for result in pool.imap_unordered(solve_input, filenames,
+                                          chunksize=chunksize):
+            failures += "error" in result
+            # numpy integers are not json serialisable
+            f.write(json.dumps(result, default=int) + "\n")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solves every input file in a directory for one day.")
+    parser.add_argument("day", type=int, help="day of the solver to use")
+    parser.add_argument("directory", help="directory of input files")
+    parser.add_argument("output", help="file to write the results to")
+    parser.add_argument("-p", "--pattern", default="*.txt",
+                        help="glob pattern of the input files")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of worker processes")
+    parser.add_argument("-c", "--chunksize", type=int, default=1,
+                        help="inputs sent to a worker at a time")
+    args = parser.parse_args()
+
+    filenames = sorted(glob.glob(os.path.join(args.directory, args.pattern)))
+    failures = solve_batch(args.day, filenames, args.output,
+                           workers=args.workers, chunksize=args.chunksize)
+    print(f"Solved {len(filenames) - failures} of {len(filenames)} inputs, "
+          f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
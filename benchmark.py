@@ -0,0 +1,146 @@
+import argparse
+import importlib
+from time import perf_counter
+import numpy as np
+from generators import GENERATORS
+
+# key: day, value: input sizes to benchmark, as understood by the generator
+SIZES = {1: (10**4, 10**5, 10**6),
+         2: (10**4, 10**5, 10**6),
+         3: (10**3, 10**4, 10**5),
+         4: (10**2, 10**3, 10**4),
+         5: (10**2, 10**3, 10**4),
+         6: (10**3, 10**4, 10**5),
+         7: (10**2, 10**3, 10**4),
+         8: (10**2, 10**3, 10**4),
+         9: (50, 100, 200),
+         10: (10**2, 10**3, 10**4),
+         11: (10, 20, 40),
+         12: (4, 6, 8),
+         13: (10**2, 10**3, 10**4),
+         14: (10**2, 10**3, 10**4),
+         15: (100, 200, 400)}
+
+PHASES = ("parse", "part1", "part2")
+
+
+def time_function(function, *args, repeat: int = 3) -> tuple:
+    """
+    Returns the result of the function and the best wall time in seconds
+    of repeated calls.
+    """
+    best_time = float("inf")
+    for _ in range(repeat):
+        start_time = perf_counter()
+        result = function(*args)
+        best_time = min(best_time, perf_counter() - start_time)
+    return result, best_time
+
+
+def benchmark_day(day: int, sizes: tuple, repeat: int = 3,
+                  seed: int = 0) -> list:
+    """
+    Benchmarks the parse, part 1 and part 2 phases of the day's solver on
+    generated inputs of each size.
+
+    Parameters
+    ----------
+    day : int
+        Day of the solver to benchmark.
+    sizes : tuple
+        Sizes of the generated inputs.
+    repeat : int, optional
+        Number of times each phase is timed, the best time is kept.
+        The default is 3.
+    seed : int, optional
+        Seed of the input generator. The default is 0.
+
+    Returns
+    -------
+    list
+        A dictionary for each size containing the size and the best time of
+        each phase. A phase that raises an error has a time of None and any
+        later phases are skipped.
+
+    """
+    module = importlib.import_module(f"day{day:02d}")
+    results = []
+    for size in sizes:
+        data_raw = GENERATORS[day](size, seed=seed)
+        result = {"size": size, "bytes": len(data_raw)}
+        try:
+            data, result["parse"] = time_function(
+                module.parse, data_raw, repeat=repeat)
+            for part in (1, 2):
+                _, result[f"part{part}"] = time_function(
+                    getattr(module, f"part{part}"), data, repeat=repeat)
+        except Exception as e:
+            result["error"] = repr(e)
+        for phase in PHASES:
+            result.setdefault(phase, None)
+        results.append(result)
+    return results
+
+
+def scaling_exponent(sizes: list, times: list) -> float:
+    """
+    Returns the slope of log(time) against log(size), ie k where time ~ size^k.
+    Returns None if fewer than two sizes have been timed.
+    """
+    points = [(s, t) for s, t in zip(sizes, times) if t]
+    if len(points) < 2:
+        return None
+    log_sizes, log_times = np.log(np.array(points, dtype=float)).T
+    return np.polyfit(log_sizes, log_times, 1)[0]
+
+
+def format_results(day: int, results: list) -> str:
+    """
+    Returns a table of the timings of each phase at each size, followed by
+    the scaling exponent of each phase.
+    """
+    header = f"{'size':>10}{'bytes':>12}" + \
+        "".join(f"{phase + ' (s)':>13}" for phase in PHASES)
+    rows = [f"Day {day:02d}", header, "-" * len(header)]
+    for result in results:
+        row = f"{result['size']:>10}{result['bytes']:>12}"
+        for phase in PHASES:
+            timing = result[phase]
+            row += f"{timing:>13.4f}" if timing is not None else f"{'-':>13}"
+        if "error" in result:
+            row += f"   {result['error']}"
+        rows.append(row)
+
+    row = f"{'scaling k':>22}"
+    sizes = [result["size"] for result in results]
+    for phase in PHASES:
+        k = scaling_exponent(sizes, [result[phase] for result in results])
+        row += f"{k:>13.2f}" if k is not None else f"{'-':>13}"
+    rows.append(row)
+    return "\n".join(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks each day's solver on generated inputs of "
+                    "increasing size and reports how the timings scale.")
+    parser.add_argument("days", nargs="*", type=int,
+                        help="days to benchmark, all days by default")
+    parser.add_argument("-s", "--sizes", nargs="+", type=int,
+                        help="input sizes, overrides the default sizes")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="number of times each phase is timed")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the input generators")
+    args = parser.parse_args()
+
+    for day in args.days or sorted(GENERATORS):
+        sizes = args.sizes or SIZES[day]
+        results = benchmark_day(day, sizes, repeat=args.repeat,
+                                seed=args.seed)
+        print(format_results(day, results))
+        print()
+
+
+if __name__ == "__main__":
+    main()
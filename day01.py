@@ -1,16 +1,24 @@
 import os
-import aocd
+import sys
+import glob
+import mmap
+import hashlib
+import inspect
+from itertools import tee
+from collections import deque
 
 DAY, YEAR = 1, 2021
 
 
 def get_input(day: int, year: int, write: bool = True,
-              transform: str = None) -> str:
+              transform=None, cache: bool = False):
     """
     Returns the input data from the advent of code calender on the
     specified day and year.
     Writes a copy into a txt file if write=True and one doesn't already exist.
     Transforms the raw input data if one is specified.
+    Caches the transformed data as a binary .npy file if cache=True, which is
+    memory mapped instead of re-reading and re-parsing the input next time.
 
     Parameters
     ----------
@@ -23,75 +31,302 @@ def get_input(day: int, year: int, write: bool = True,
     write : bool, optional
         Writes raw input data to txt file.
         The default is True.
-    transform : str, optional
-        Transforms raw data if transform = 'numbers' or 'lines'.
+    transform : str or function, optional
+        Transforms raw data if transform = 'numbers' or 'lines', or if
+        transform is a function that takes the raw data as its only argument.
         The default is None.
+    cache : bool, optional
+        Caches the output of a transform function if it is a numpy array.
+        The cache is keyed by a hash of the raw input file, of the source of
+        the transform's module and of its PARSE_VERSION, and is invalidated
+        when any of them changes. Bump PARSE_VERSION when a helper from
+        another module that the transform calls changes. Cached arrays are
+        loaded read-only.
+        The default is False.
 
     Returns
     -------
     str
-        raw input data as one large string
+        raw input data as one large string, or the transformed data
 
     """
+    filename = f"{day:02d}_{year}_input.txt"
+    cache = cache and callable(transform)
     try:
         # get raw data
-        if os.path.isfile(f"./{day:02d}_{year}_input.txt"):
-            with open(f"{day:02d}_{year}_input.txt", "r") as f:
+        if os.path.isfile(filename):
+            # cached transformed data skips reading and parsing the input
+            if cache:
+                cached_data = load_cache(day, year, transform.__name__,
+                                         hash_file(filename, transform))
+                if cached_data is not None:
+                    return cached_data
+            with open(filename, "r") as f:
                 data_raw = f.read()
         else:
-            data_raw = aocd.get_data(day=day, year=year)
+            data_raw = fetch_input(day, year)
+            if data_raw is None:
+                return ""
             if write:
-                with open(f"{day:02d}_{year}_input.txt", "w") as f:
+                with open(filename, "w") as f:
                     f.write(data_raw)
 
         # optional data transforms
         if transform == "lines":
-            return aocd.transforms.lines(data_raw)
+            return data_raw.splitlines()
         elif transform == "numbers":
+            import aocd
             return aocd.transforms.numbers(data_raw)
+        elif callable(transform):
+            data = transform(data_raw)
+            # the cache is keyed by the input file so it must exist
+            if cache and os.path.isfile(filename):
+                save_cache(data, day, year, transform.__name__,
+                           hash_file(filename, transform))
+            return data
         else:
             return data_raw
 
-    except aocd.exceptions.PuzzleLockedError as e:
-        print(e)
-        return ""
     except ValueError as e:
         print(e)
         return ""
 
 
+def fetch_input(day: int, year: int) -> str:
+    """
+    Returns the raw input data downloaded from the advent of code website,
+    or None if the puzzle is still locked.
+    aocd is imported here rather than at the top of the module so that
+    reading a local copy of the input never pays for importing it.
+    """
+    import aocd
+    try:
+        return aocd.get_data(day=day, year=year)
+    except aocd.exceptions.PuzzleLockedError as e:
+        print(e)
+        return None
+
+
+def stream_input(day: int, year: int, source: str = None,
+                 chunk_size: int = None, memory_map: bool = False):
+    """
+    Yields the input data lazily, one line at a time without line breaks,
+    so that memory use does not grow with the size of the input.
+
+    Parameters
+    ----------
+    day : int
+        Day of the advent of code calender to get input from.
+    year : int
+        Year of the advent of code calender to get input from.
+    source : str, optional
+        File to read, or '-' to read from stdin. The default is None, the
+        local copy of the input which is downloaded first if necessary.
+    chunk_size : int, optional
+        Yields fixed size chunks of bytes instead of lines if specified.
+        The default is None.
+    memory_map : bool, optional
+        Reads the file through a read-only memory map instead of buffered
+        reads. Not available for stdin. The default is False.
+
+    Yields
+    ------
+    str or bytes
+        Each line of the input, or each chunk if chunk_size is specified.
+
+    """
+    if source is None:
+        source = f"{day:02d}_{year}_input.txt"
+        if not os.path.isfile(source):
+            get_input(day, year)
+
+    if source == "-":
+        if chunk_size is not None:
+            yield from iter(lambda: sys.stdin.buffer.read(chunk_size), b"")
+        else:
+            for line in sys.stdin:
+                yield line.rstrip("\r\n")
+        return
+
+    with open(source, "rb") as f:
+        # empty files cannot be memory mapped
+        if memory_map and os.path.getsize(source) > 0:
+            reader = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            reader = f
+        try:
+            if chunk_size is not None:
+                yield from iter(lambda: reader.read(chunk_size), b"")
+            else:
+                for line in iter(reader.readline, b""):
+                    yield line.decode().rstrip("\r\n")
+        finally:
+            if reader is not f:
+                reader.close()
+
+
+def hash_file(filename: str, transform=None,
+              chunk_size: int = 1 << 20) -> str:
+    """
+    Returns the hex digest of the file contents, read in chunks so that large
+    files are never held in memory.
+    The source and PARSE_VERSION of the module of the transform function are
+    included if given, so that changing the module or bumping its version
+    changes the digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    module = sys.modules.get(getattr(transform, "__module__", None))
+    if module is not None:
+        digest.update(str(getattr(module, "PARSE_VERSION", 0)).encode())
+        try:
+            digest.update(inspect.getsource(module).encode())
+        except (OSError, TypeError):
+            # modules without source files are keyed by their version only
+            pass
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_filename(day: int, year: int, name: str, digest: str) -> str:
+    """
+    Returns the filename of the binary cache of the named transform of the
+    input with the given hash.
+    """
+    return f"{day:02d}_{year}_{name}_{digest}.npy"
+
+
+def load_cache(day: int, year: int, name: str, digest: str):
+    """
+    Returns the cached array as a read-only memory map, or None if no cache
+    exists for this input.
+    """
+    filename = cache_filename(day, year, name, digest)
+    if os.path.isfile(filename):
+        import numpy as np
+        return np.load(filename, mmap_mode="r")
+    return None
+
+
+def save_cache(data, day: int, year: int, name: str, digest: str) -> None:
+    """
+    Saves the array to a binary cache and removes caches of any older
+    versions of the input. Objects that cannot be memory mapped are skipped.
+    """
+    # data cannot be an array if numpy was never imported
+    if "numpy" not in sys.modules:
+        return
+    import numpy as np
+    if not isinstance(data, np.ndarray) or data.dtype.hasobject:
+        return
+    filename = cache_filename(day, year, name, digest)
+    for old_filename in glob.glob(cache_filename(day, year, name, "*")):
+        if old_filename != filename:
+            # another process may have already removed it
+            try:
+                os.remove(old_filename)
+            except FileNotFoundError:
+                pass
+    # written to a temporary file first so that other processes never load
+    # a partially written cache
+    temp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(temp_filename, "wb") as f:
+        np.save(f, data)
+    os.replace(temp_filename, filename)
+
+
 def submit_answer(answer, part: str, day: int, year: int, submit: bool = True):
     if submit:
+        import aocd
         aocd.post.submit(answer, part=part, day=day, year=year)
 
 
-def sliding_window(collection, window_size: int,
-                   operation=lambda x: x) -> list:
+def is_array(collection) -> bool:
+    """
+    Returns True if the collection is a numpy array, without importing numpy.
+    """
+    return type(collection).__module__ == "numpy" and \
+        hasattr(collection, "strides")
+
+
+def sliding_window(collection, window_size: int, operation=None):
     """
-    Returns a list containing the result of the specified operation on each
-    window. By default no operation is performed.
+    Returns an iterable of the result of the specified operation on each
+    window, computed lazily. By default no operation is performed.
+    Numpy arrays are windowed with strided views instead of copies, any other
+    iterable with a deque so it can be a generator.
+    Sums are computed as a rolling sum, in O(1) per window.
 
     Parameters
     ----------
     collection
-        Any data type that can be indexed on which the sliding window
-        will operate.
+        Any iterable on which the sliding window will operate.
     window_size : int
         The size of the window that will slide over the collection.
     operation : function, optional
         The operation to be performed on each window.
-        The default is lambda x: x.
+        The default is None.
 
     Returns
     -------
-    list
-        A list containing the result of each operation on each window.
+    iterable
+        The result of each operation on each window. For numpy arrays this is
+        an array if operation is None or sum, otherwise a generator.
+
+    """
+    if is_array(collection):
+        import numpy as np
+        if operation is sum:
+            return rolling_sum_array(collection, window_size)
+        windows = np.lib.stride_tricks.sliding_window_view(
+            collection, window_size)
+        return windows if operation is None else map(operation, windows)
+    if operation is sum:
+        return rolling_sum(collection, window_size)
+    windows = iterate_windows(collection, window_size)
+    return windows if operation is None else map(operation, windows)
+
+
+def iterate_windows(collection, window_size: int):
+    """
+    Lazily yields each window of the iterable as a tuple.
+    """
+    window = deque(maxlen=window_size)
+    for item in collection:
+        window.append(item)
+        if len(window) == window_size:
+            yield tuple(window)
+
 
+def rolling_sum(collection, window_size: int):
     """
-    windows = []
-    for i in range(len(collection) - window_size + 1):
-        windows.append(operation(collection[i: i + window_size]))
-    return windows
+    Lazily yields the sum of each window of the iterable, adding the item
+    entering the window and subtracting the one leaving it.
+    """
+    window = deque()
+    total = 0
+    for item in collection:
+        window.append(item)
+        total += item
+        if len(window) > window_size:
+            total -= window.popleft()
+        if len(window) == window_size:
+            yield total
+
+
+def rolling_sum_array(array, window_size: int):
+    """
+    Returns an array of the sum of each window of the numpy array, from the
+    differences of its cumulative sum.
+    """
+    import numpy as np
+    if window_size > len(array):
+        return array[:0].copy()
+    cumulative = np.cumsum(array)
+    sums = cumulative[window_size - 1:].copy()
+    sums[1:] -= cumulative[:-window_size]
+    return sums
 
 
 def pairwise_comparison(collection, comparison) -> int:
@@ -100,12 +335,15 @@ def pairwise_comparison(collection, comparison) -> int:
     of how often comparison is True.
     Note that by 'pairs' is meant a sliding window of size = 2.
 
+    Numpy arrays are compared in a single vectorized operation.
+
     Parameters
     ----------
     collection
-        Any datatype that can be indexed.
+        Any iterable, including generators.
     comparison : function
-        Function used to compare each pair.
+        Function used to compare each pair. Must compare elementwise if the
+        collection is a numpy array, eg lambda x, y: x > y.
 
     Returns
     -------
@@ -113,25 +351,95 @@ def pairwise_comparison(collection, comparison) -> int:
         Count of all True comparisons
 
     """
+    if is_array(collection):
+        import numpy as np
+        return int(np.count_nonzero(
+            comparison(collection[1:], collection[:-1])))
+
+    # pairs each item with the next one, without copying any windows
+    previous_items, current_items = tee(collection)
+    next(current_items, None)
     count = 0
-    for previous, current in sliding_window(collection, 2):
+    for previous, current in zip(previous_items, current_items):
         count += comparison(current, previous)
     return count
 
 
-def main():
-    # get data
-    data = aocd.transforms.numbers(get_input(DAY, YEAR))
+class DepthMonitor():
+    """
+    Class that keeps count of how often the depth increases, and how often
+    the sum of a sliding window of depths increases, as readings arrive from
+    a live feed. Each reading is processed in O(1).
+    """
+
+    def __init__(self, window_size: int = 3):
+        self.window_size = window_size
+        # only the readings needed to compare the latest windows are kept
+        self.readings = deque(maxlen=window_size + 1)
+        self.increases = 0
+        self.window_increases = 0
+
+    def update(self, depth: int) -> tuple:
+        """
+        Adds a new depth reading and returns the updated counts of increases
+        and window increases.
+        """
+        self.readings.append(depth)
+        if len(self.readings) > 1 and depth > self.readings[-2]:
+            self.increases += 1
+        # consecutive windows share all but one reading, so the sum only
+        # increases if the reading entering is larger than the one leaving
+        if len(self.readings) > self.window_size and \
+                depth > self.readings[0]:
+            self.window_increases += 1
+        return self.increases, self.window_increases
+
+    async def monitor(self, feed):
+        """
+        Consumes an asynchronous feed of depth readings, yielding the updated
+        counts after each one.
+        """
+        async for depth in feed:
+            yield self.update(depth)
+
+
+def parse(data_raw: str):
+    """
+    Returns the sonar sweep depth readings as a numpy array.
+    """
+    import numpy as np
+    return np.array(data_raw.split(), dtype=np.int64)
+
+
+def part1(data) -> int:
+    """
+    Returns the number of times the depth increases.
+    """
     # greater than operator
     comparison = lambda x, y: x > y
+    return pairwise_comparison(data, comparison)
+
+
+def part2(data) -> int:
+    """
+    Returns the number of times the sum of a three-measurement window of
+    depths increases.
+    """
+    # greater than operator
+    comparison = lambda x, y: x > y
+    return pairwise_comparison(sliding_window(data, 3, sum), comparison)
+
+
+def main():
+    # get data
+    data = get_input(DAY, YEAR, transform=parse, cache=True)
 
     # part 1
-    part1_answer = pairwise_comparison(data, comparison)
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    part2_answer = pairwise_comparison(
-        sliding_window(data, 3, sum), comparison)
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
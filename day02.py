@@ -1,15 +1,28 @@
-from day1 import get_input, submit_answer
+import sys
+import numpy as np
+from day01 import get_input, stream_input, submit_answer
 
 DAY, YEAR = 2, 2021
 
+# opcodes of a compiled course, see compile_course()
+FORWARD, DOWN, UP = 0, 1, 2
+# key: first letter of a direction, value: its opcode, -1 for anything else
+OPCODES = np.full(256, -1, dtype=np.int8)
+OPCODES[[ord("f"), ord("d"), ord("u")]] = FORWARD, DOWN, UP
+# key: opcode, value: change of aim per unit of distance
+AIM_SIGNS = np.array([0, 1, -1])
+
 
 class Submarine():
     """
     Class that stores the position, depth and aim of the submarine and contains
     methods to set a new course.
+    Without a part, both instruction sets are followed at once: depth and aim
+    follow part 2 and part1_depth follows part 1.
     """
+    __slots__ = ("part", "horizontal_pos", "depth", "aim", "part1_depth")
 
-    def __init__(self, part: int,
+    def __init__(self, part: int = None,
                  horizontal_pos: int = 0, depth: int = 0, aim: int = 0):
         # 'part' determines which instruction set the course corrections will
         # use
@@ -17,19 +30,25 @@ class Submarine():
         self.horizontal_pos = horizontal_pos
         self.depth = depth
         self.aim = aim
+        self.part1_depth = depth
 
-    def set_course(self, course: list):
+    def set_course(self, course):
+        # course can be any iterable of instructions, eg a streamed file,
+        # it is only read once, one instruction at a time
+        # state is kept in locals while looping, it is much faster
+        horizontal_pos, depth, aim = self.horizontal_pos, self.depth, self.aim
+        part1_depth = self.part1_depth
         # instruction set for part 1
         if self.part == 1:
             for instruction in course:
                 direction, distance = instruction.split()
                 distance = int(distance)
                 if direction == "forward":
-                    self.horizontal_pos += distance
+                    horizontal_pos += distance
                 elif direction == "down":
-                    self.depth += distance
+                    depth += distance
                 elif direction == "up":
-                    self.depth -= distance
+                    depth -= distance
                 else:
                     print(f"Incorrect course change: {instruction= }")
         # instruction set for part 2
@@ -38,32 +57,228 @@ class Submarine():
                 direction, distance = instruction.split()
                 distance = int(distance)
                 if direction == "forward":
-                    self.horizontal_pos += distance
-                    self.depth += self.aim * distance
+                    horizontal_pos += distance
+                    depth += aim * distance
                 elif direction == "down":
-                    self.aim += distance
+                    aim += distance
                 elif direction == "up":
-                    self.aim -= distance
+                    aim -= distance
+                else:
+                    print(f"Incorrect course change: {instruction= }")
+        # both instruction sets
+        elif self.part is None:
+            for instruction in course:
+                direction, distance = instruction.split()
+                distance = int(distance)
+                if direction == "forward":
+                    horizontal_pos += distance
+                    depth += aim * distance
+                elif direction == "down":
+                    aim += distance
+                    part1_depth += distance
+                elif direction == "up":
+                    aim -= distance
+                    part1_depth -= distance
                 else:
                     print(f"Incorrect course change: {instruction= }")
         else:
             print(f"Incorrect part specified: {self.part= }")
+        self.horizontal_pos, self.depth, self.aim = horizontal_pos, depth, aim
+        self.part1_depth = part1_depth
+
+    def set_compiled_course(self, course: tuple):
+        # course is a tuple of opcode and distance arrays from
+        # compile_course(), evaluated without looping over instructions
+        opcodes, distances = course
+        if self.part not in (1, 2, None):
+            print(f"Incorrect part specified: {self.part= }")
+            return
+        # total distance of each opcode, summed as integers so that large
+        # totals stay exact
+        forward, down, up = (int(np.sum(distances[opcodes == opcode]))
+                             for opcode in (FORWARD, DOWN, UP))
+        self.horizontal_pos += forward
+        if self.part == 1:
+            self.depth += down - up
+            return
+        # aim during each instruction is a prefix sum of up and down
+        aim = self.aim + np.cumsum(AIM_SIGNS[opcodes] * distances)
+        self.depth += int(aim @ np.where(opcodes == FORWARD, distances, 0))
+        self.aim += down - up
+        if self.part is None:
+            self.part1_depth += down - up
+
+
+class Fleet():
+    """
+    Class that stores the positions, depths and aims of many submarines, one
+    array element per submarine, and contains methods to set a new course for
+    every submarine at once.
+    The parts follow the same instruction sets as Submarine.
+    """
+    __slots__ = ("part", "horizontal_pos", "depth", "aim", "part1_depth")
+
+    def __init__(self, size: int, part: int = None,
+                 horizontal_pos=0, depth=0, aim=0):
+        # starting states are either one value for the whole fleet or an
+        # array with one value per submarine
+        self.part = part
+        self.horizontal_pos = np.full(size, horizontal_pos, dtype=np.int64)
+        self.depth = np.full(size, depth, dtype=np.int64)
+        self.aim = np.full(size, aim, dtype=np.int64)
+        self.part1_depth = self.depth.copy()
+
+    def __len__(self) -> int:
+        return len(self.horizontal_pos)
+
+    def set_courses(self, courses: list) -> tuple:
+        # one course per submarine, compiled by compile_course() or raw
+        # all courses are joined and evaluated together, sums over each
+        # submarine's instructions are differences of running totals at
+        # the boundaries between courses
+        if len(courses) != len(self):
+            raise ValueError(f"{len(courses)} courses for a fleet of "
+                             f"{len(self)} submarines")
+        if self.part not in (1, 2, None):
+            print(f"Incorrect part specified: {self.part= }")
+            return self.horizontal_pos, self.depth
+        # an empty fleet has nothing to join
+        if len(courses) == 0:
+            return self.horizontal_pos, self.depth
+        courses = [compile_course(course) if isinstance(course, str)
+                   else course for course in courses]
+        opcodes = np.concatenate([course[0] for course in courses])
+        distances = np.concatenate([course[1] for course in courses])
+        lengths = [len(course[0]) for course in courses]
+        bounds = np.append(0, np.cumsum(lengths))
+
+        def course_sums(values: np.ndarray) -> np.ndarray:
+            totals = np.append(0, np.cumsum(values))
+            return totals[bounds[1:]] - totals[bounds[:-1]]
+
+        forward = np.where(opcodes == FORWARD, distances, 0)
+        vertical = AIM_SIGNS[opcodes] * distances
+        self.horizontal_pos += course_sums(forward)
+        if self.part == 1:
+            self.depth += course_sums(vertical)
+            return self.horizontal_pos, self.depth
+
+        # aim during each instruction, the running total of up and down
+        # restarted at the beginning of each course
+        aim = np.cumsum(vertical)
+        aim -= np.repeat(np.append(0, aim)[bounds[:-1]], lengths)
+        aim += np.repeat(self.aim, lengths)
+        self.depth += course_sums(aim * forward)
+        self.aim += course_sums(vertical)
+        if self.part is None:
+            self.part1_depth += course_sums(vertical)
+        return self.horizontal_pos, self.depth
+
 
+def compile_course(data_raw: str) -> tuple:
+    """
+    Compiles a course into compact arrays without splitting it into lines.
+
+    Parameters
+    ----------
+    data_raw : str
+        The course, one instruction per line.
+
+    Raises
+    ------
+    ValueError
+        If an instruction has an unknown direction or no distance.
+
+    Returns
+    -------
+    tuple
+        An array of the opcode (FORWARD, DOWN or UP) of each instruction and
+        an array of their distances.
+
+    """
+    buffer = np.frombuffer(data_raw.replace("\r", "").strip().encode(),
+                           dtype=np.uint8)
+    if len(buffer) == 0:
+        return np.empty(0, dtype=np.int8), np.empty(0, dtype=np.int64)
+    line_ends = np.append(np.flatnonzero(buffer == ord("\n")), len(buffer))
+    line_starts = np.append(0, line_ends[:-1] + 1)
+
+    opcodes = OPCODES[buffer[line_starts]]
+    spaces = np.flatnonzero(buffer == ord(" "))
+    if (opcodes < 0).any():
+        line = int(np.argmax(opcodes < 0))
+        raise ValueError(f"Incorrect course change on line {line + 1}")
+    if len(spaces) != len(line_starts):
+        raise ValueError("Incorrect course, every instruction needs a "
+                         "direction and a distance separated by a space")
 
-def main():
-    # get data
-    data = get_input(DAY, YEAR, transform="lines")
+    # distances are read one digit at a time from the end of each line,
+    # for all lines at once
+    distances = np.zeros(len(line_starts), dtype=np.int64)
+    widths = line_ends - spaces - 1
+    for place in range(widths.max()):
+        digits = buffer[np.maximum(line_ends - 1 - place, 0)].astype(np.int64)
+        distances += np.where(place < widths, digits - ord("0"), 0) * \
+            10 ** place
+    return opcodes, distances
 
-    # part 1
+
+def parse(data_raw: str) -> tuple:
+    """
+    Returns the compiled course.
+    """
+    return compile_course(data_raw)
+
+
+def part1(data) -> int:
+    """
+    Returns the product of the final depth and horizontal position using the
+    instruction set of part 1.
+    """
     sub1 = Submarine(1)
-    sub1.set_course(data)
-    part1_answer = sub1.depth * sub1.horizontal_pos
-    print(f"Part 1 Answer: {part1_answer}")
+    # compiled by parse(), otherwise an iterable of instructions
+    if isinstance(data, tuple):
+        sub1.set_compiled_course(data)
+    else:
+        sub1.set_course(data)
+    return sub1.depth * sub1.horizontal_pos
 
-    # part 2
+
+def part2(data) -> int:
+    """
+    Returns the product of the final depth and horizontal position using the
+    instruction set of part 2.
+    """
     sub2 = Submarine(2)
-    sub2.set_course(data)
-    part2_answer = sub2.depth * sub2.horizontal_pos
+    if isinstance(data, tuple):
+        sub2.set_compiled_course(data)
+    else:
+        sub2.set_course(data)
+    return sub2.depth * sub2.horizontal_pos
+
+
+def solve(data) -> tuple:
+    """
+    Returns the answers to both parts from a single pass over the course,
+    either compiled by parse() or any iterable of instructions.
+    """
+    submarine = Submarine()
+    if isinstance(data, tuple):
+        submarine.set_compiled_course(data)
+    else:
+        submarine.set_course(data)
+    return (submarine.part1_depth * submarine.horizontal_pos,
+            submarine.depth * submarine.horizontal_pos)
+
+
+def main(stream: bool = False):
+    # get data, or stream it from the input file once for both parts
+    data = stream_input(DAY, YEAR) if stream else \
+        get_input(DAY, YEAR, transform=parse)
+
+    # parts 1 and 2
+    part1_answer, part2_answer = solve(data)
+    print(f"Part 1 Answer: {part1_answer}")
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
@@ -72,4 +287,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(stream="--stream" in sys.argv)
@@ -1,17 +1,22 @@
 import numpy as np
-from day1 import get_input, submit_answer
+from day01 import get_input, submit_answer
+from grid import load_digit_grid
 
 DAY, YEAR = 3, 2021
+# version of the parsed input cache, bump when load_digit_grid() changes
+PARSE_VERSION = 1
 
 
-def find_common_bit(array: np.ndarray, criteria: str) -> int:
+# key: byte value, value: its bits from least to most significant
+BYTE_BITS = (np.arange(256)[:, None] >> np.arange(8)) & 1
+
+
+def find_common_bit(count0: int, count1: int, criteria: str) -> int:
     """
-    Returns the most, or least, common bit in a numpy array.
+    Returns the most, or least, common bit given the number of 0s and 1s.
     Ties are resolved as specified by the challenge.
     Note return is int and not str.
     """
-    count1 = sum(array)
-    count0 = len(array) - count1
     if "most" in criteria:
         return 0 if count0 > count1 else 1
     elif "least" in criteria:
@@ -21,58 +26,125 @@ def find_common_bit(array: np.ndarray, criteria: str) -> int:
         return None
 
 
-def most_common_bits(array: np.ndarray) -> str:
+def count_bits(words: np.ndarray, width: int) -> np.ndarray:
     """
-    Returns a string of the most common bits in each position.
+    Returns the number of rows with a 1 in each bit position, most
+    significant first.
+    Counts are taken a byte at a time: a histogram of the values of each
+    byte of the words, multiplied by the bits of every byte value.
     """
-    columns = array.shape[1]
-    bits = ""
-    for i in range(columns):
-        bits += str(find_common_bit(array[:, i], "most"))
-    return bits
+    counts = np.concatenate([
+        np.bincount(column, minlength=256) @ BYTE_BITS
+        for column in words.astype("<u8").view(np.uint8).reshape(-1, 8).T])
+    return counts[width - 1::-1]
 
 
-def filtered_common_bits(array: np.ndarray, criteria: str) -> str:
+def most_common_bits(words: np.ndarray, width: int) -> int:
+    """
+    Returns the most common bit in each position, as the bits of an int.
     """
-    Returns the single row left after filtering the array by the most,
+    common = 2 * count_bits(words, width) >= len(words)
+    return sum(1 << (width - 1 - i) for i in np.flatnonzero(common).tolist())
+
+
+def filtered_common_bits(words: np.ndarray, width: int, criteria: str,
+                         is_sorted: bool = False) -> int:
+    """
+    Returns the single row left after filtering the words by the most,
     or least, common bit in each position.
-    Will fail and throw an error if no unique row is found (duplicates).
+    The words are sorted once, then the rows left are always a range
+    [lo, hi) of the sorted words: they share all the bits filtered so far,
+    so the rows with a 0 in the next position come before those with a 1
+    and the split is found by binary search.
+    If every row left has the same bit, they are all kept.
+    Duplicates left after the last bit are identical, so any is returned.
+    """
+    if not is_sorted:
+        words = np.sort(words)
+    lo, hi = 0, len(words)
+    for shift in range(width - 1, -1, -1):
+        if hi - lo <= 1:
+            break
+        # smallest word in the range with a 1 in this position
+        first_one = (int(words[lo]) >> (shift + 1) << (shift + 1)) | \
+            (1 << shift)
+        mid = lo + int(np.searchsorted(words[lo:hi], np.uint64(first_one)))
+        bit = find_common_bit(mid - lo, hi - mid, criteria)
+        # keeps the other rows when none have the chosen bit
+        if (bit == 1 and mid < hi) or mid == lo:
+            lo = mid
+        else:
+            hi = mid
+    return int(words[lo])
+
+
+def flip_bits(bits: int, width: int) -> int:
+    """
+    Swaps all the 1s and 0s of the lowest width bits.
+    """
+    return bits ^ ((1 << width) - 1)
+
+
+def parse(data_raw: str) -> np.ndarray:
+    """
+    Returns the diagnostic report packed into a numpy array of uint64: the
+    number of bits in each row (up to 64), followed by one word per row.
+    A single array, so that it can be cached by get_input().
+    """
+    bits = load_digit_grid(data_raw)
+    rows, width = bits.shape
+    if width > 64:
+        raise ValueError(f"Rows of {width} bits do not fit in 64 bit words")
+    # packs each row into bytes, then right aligns them in a 64 bit word
+    packed = np.packbits(bits, axis=1)
+    words = np.zeros((rows, 8), dtype=np.uint8)
+    words[:, 8 - packed.shape[1]:] = packed
+    words = words.view(">u8").ravel().astype(np.uint64)
+    words >>= np.uint64(8 * packed.shape[1] - width)
+    return np.concatenate((np.array([width], dtype=np.uint64), words))
+
+
+def unpack_report(data: np.ndarray) -> tuple:
+    """
+    Returns the words and the width of a report returned by parse().
+    """
+    return data[1:], int(data[0])
+
+
+def part1(data: np.ndarray) -> int:
+    """
+    Returns the power consumption, the product of the gamma and epsilon rates.
     """
-    rows = array.shape[0]
-    i = 0
-    array_filtered = np.copy(array)
-    while rows > 1:
-        col_i = array_filtered[:, i]
-        array_filtered = array_filtered[col_i ==
-                                        find_common_bit(col_i, criteria)]
-        i += 1
-        rows = array_filtered.shape[0]
-    return np.array2string(array_filtered, separator="").strip("[]")
+    words, width = unpack_report(data)
+    gamma_rate = most_common_bits(words, width)
+    epsilon_rate = flip_bits(gamma_rate, width)
+    return gamma_rate * epsilon_rate
 
 
-def flip_bits(bits: str) -> str:
+def part2(data: np.ndarray) -> int:
     """
-    Swaps all the '1's and '0's
+    Returns the life support rating, the product of the oxygen generator and
+    CO2 scrubber ratings.
     """
-    return bits.replace("1", "temp").replace("0", "1").replace("temp", "0")
+    words, width = unpack_report(data)
+    words = np.sort(words)
+    oxygen_generator_rating = filtered_common_bits(words, width, "most",
+                                                   is_sorted=True)
+    co2_scrubber_rating = filtered_common_bits(words, width, "least",
+                                               is_sorted=True)
+    return oxygen_generator_rating * co2_scrubber_rating
 
 
 def main():
-    # get data and load it into an numpy array
-    get_input(DAY, YEAR)
-    data = np.genfromtxt("03_2021_input.txt", dtype="u1", delimiter=1)
+    # get data and pack it into an numpy array
+    data = get_input(DAY, YEAR, transform=parse, cache=True)
 
     # part 1
-    gamma_rate = most_common_bits(data)
-    epsilon_rate = flip_bits(gamma_rate)
-    part1_answer = int(gamma_rate, 2) * int(epsilon_rate, 2)
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    oxygen_generator_rating = filtered_common_bits(data, "most")
-    co2_scrubber_rating = filtered_common_bits(data, "least")
-    part2_answer = int(
-        oxygen_generator_rating, 2) * int(co2_scrubber_rating, 2)
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
@@ -1,5 +1,5 @@
 import numpy as np
-from day1 import get_input, submit_answer
+from day01 import get_input, submit_answer
 
 DAY, YEAR = 4, 2021
 
@@ -46,31 +46,253 @@ def score_bingo_card(card: list) -> int:
         if win_checker(card[1]) else 0
 
 
-def main():
-    # get raw data
-    data_raw = get_input(DAY, YEAR)
-    # extract bingo numbers drawn as a list of ints
+class LiveBingo():
+    """
+    Class that plays bingo on many cards as the numbers are drawn one at a
+    time. An inverted index of where each number appears on the cards and
+    counters of the marked numbers in each row and column mean that a draw
+    only touches the cells containing that number.
+    """
+
+    def __init__(self, bingo_cards: np.ndarray):
+        self.bingo_cards = np.asarray(bingo_cards)
+        cards, rows, cols = self.bingo_cards.shape
+        self.marked = np.zeros((cards, rows, cols), dtype=bool)
+        self.row_counts = np.zeros((cards, rows), dtype=np.int32)
+        self.col_counts = np.zeros((cards, cols), dtype=np.int32)
+        self.won = np.zeros(cards, dtype=bool)
+        self.draws = 0
+        # key: number, value: flat indices of the cells containing it
+        flat_cards = self.bingo_cards.ravel()
+        order = np.argsort(flat_cards, kind="stable")
+        numbers, starts = np.unique(flat_cards[order], return_index=True)
+        self.index = dict(zip(numbers.tolist(), np.split(order, starts[1:])))
+
+    def draw(self, number: int) -> list:
+        """
+        Marks the number on every card containing it and returns a list of
+        tuples of the index and score of each card that won on this draw,
+        in card order.
+        """
+        self.draws += 1
+        cells = self.index.get(number)
+        if cells is None:
+            return []
+        cards, rows, cols = np.unravel_index(cells, self.marked.shape)
+        # a number drawn again is already marked
+        unmarked = ~self.marked[cards, rows, cols]
+        cards, rows, cols = cards[unmarked], rows[unmarked], cols[unmarked]
+        self.marked[cards, rows, cols] = True
+        # a number can appear more than once on the same line
+        np.add.at(self.row_counts, (cards, rows), 1)
+        np.add.at(self.col_counts, (cards, cols), 1)
+
+        complete = (self.row_counts[cards, rows] == self.marked.shape[2]) | \
+            (self.col_counts[cards, cols] == self.marked.shape[1])
+        new_winners = np.unique(cards[complete])
+        new_winners = new_winners[~self.won[new_winners]]
+        self.won[new_winners] = True
+        # same format as the cards returned by play_bingo()
+        return [(card, int(score_bingo_card(
+            [self.bingo_cards[card], self.marked[card], number,
+             self.draws - 1])))
+            for card in new_winners.tolist()]
+
+
+def rank_cards(bingo_cards: np.ndarray, numbers_drawn) -> np.ndarray:
+    """
+    Returns an array of the same shape as the bingo cards containing the
+    draw index (rank) of every number on every card. Numbers that are never
+    drawn have the rank len(numbers_drawn).
+    """
+    numbers_drawn = np.asarray(numbers_drawn)
+    never = len(numbers_drawn)
+    size = max(int(bingo_cards.max(initial=0)),
+               int(numbers_drawn.max(initial=0))) + 1
+    ranks = np.full(size, never, dtype=np.int32)
+    # assigned in reverse so that numbers drawn twice keep their first draw
+    ranks[numbers_drawn[::-1]] = np.arange(never - 1, -1, -1)
+    return ranks[bingo_cards]
+
+
+def rank_bingo(bingo_cards: np.ndarray, numbers_drawn) -> tuple:
+    """
+    Plays bingo on all the cards at once without replaying the draws.
+
+    A row or column is complete once its highest ranked number has been
+    drawn, and a card wins with its first complete row or column.
+
+    Parameters
+    ----------
+    bingo_cards : np.ndarray
+        Array of shape (cards, 5, 5) of all the bingo cards.
+    numbers_drawn : list or np.ndarray
+        The numbers drawn, in order.
+
+    Returns
+    -------
+    tuple
+        An array of the draw index on which each card wins, or
+        len(numbers_drawn) if it never wins, and an array of the score of
+        each card when it wins, 0 if it never wins.
+
+    """
+    numbers_drawn = np.asarray(numbers_drawn)
+    ranks = rank_cards(bingo_cards, numbers_drawn)
+    win_turns = np.minimum(ranks.max(axis=2).min(axis=1),
+                           ranks.max(axis=1).min(axis=1))
+    unmarked = np.where(ranks > win_turns[:, None, None],
+                        bingo_cards, 0).sum(axis=(1, 2))
+    # cards that never win are scored with a last number of 0
+    last_numbers = np.append(numbers_drawn, 0)[win_turns]
+    return win_turns, unmarked * last_numbers
+
+
+def find_winners(win_turns: np.ndarray, never: int) -> tuple:
+    """
+    Returns the index of the first and of the last winning card, in the same
+    order as play_bingo(): ties go to the first card for the first winner and
+    to the last card for the last winner. Cards that win on the turn never
+    are excluded, if no card wins both indices are None.
+    """
+    winning = np.flatnonzero(win_turns < never)
+    if len(winning) == 0:
+        return None, None
+    turns = win_turns[winning]
+    first = winning[np.argmin(turns)]
+    last = winning[len(turns) - 1 - np.argmax(turns[::-1])]
+    return int(first), int(last)
+
+
+def simulate(bingo_cards: np.ndarray, numbers, trials: int,
+             seed: int = None, max_cells: int = 2**24) -> dict:
+    """
+    Plays bingo on all the cards for many random orders of the numbers
+    drawn, ranking the cards of a chunk of trials at once.
+
+    Parameters
+    ----------
+    bingo_cards : np.ndarray
+        Array of shape (cards, 5, 5) of all the bingo cards.
+    numbers : list or np.ndarray
+        The numbers that can be drawn, shuffled for each trial.
+    trials : int
+        Number of random draw orders.
+    seed : int, optional
+        Seed of the random draw orders. The default is None.
+    max_cells : int, optional
+        Maximum number of card cells ranked at once, which bounds the memory
+        used to about 3 bytes per cell (5 bytes with over 32767 numbers).
+        The default is 2**24.
+
+    Returns
+    -------
+    dict
+        'first_wins' and 'last_wins': the fraction of trials in which each
+        card wins first or last, with the same tie breaking as
+        find_winners().
+        'scores': array of shape (trials, cards) of the score of each card
+        when it wins in each trial, 0 if it never wins, so column k is the
+        score distribution of card k.
+        'first_winners' and 'last_winners': the index of the first and last
+        winning card of each trial, -1 if no card wins.
+        'first_scores' and 'last_scores': the score of the first and last
+        winning card of each trial, 0 if no card wins.
+
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.asarray(numbers)
+    cards = len(bingo_cards)
+    never = len(numbers)
+    size = max(int(bingo_cards.max(initial=0)),
+               int(numbers.max(initial=0))) + 1
+    first_wins = np.zeros(cards, dtype=np.int64)
+    last_wins = np.zeros(cards, dtype=np.int64)
+    scores = np.zeros((trials, cards), dtype=np.int64)
+    first_winners = np.full(trials, -1, dtype=np.int64)
+    last_winners = np.full(trials, -1, dtype=np.int64)
+    dtype = np.int16 if never < 2**15 else np.int32
+
+    chunk_size = max(1, max_cells // bingo_cards[0].size // max(cards, 1))
+    for start in range(0, trials, chunk_size):
+        chunk = np.arange(start, min(start + chunk_size, trials))
+        draws = rng.permuted(np.tile(numbers, (len(chunk), 1)), axis=1)
+        # rank of every number in each trial, then of every card cell
+        ranks = np.full((len(chunk), size), never, dtype=dtype)
+        np.put_along_axis(ranks, draws, np.arange(never, dtype=dtype), axis=1)
+        ranks = ranks[:, bingo_cards]
+        win_turns = np.minimum(ranks.max(axis=3).min(axis=2),
+                               ranks.max(axis=2).min(axis=2))
+
+        first = np.argmin(win_turns, axis=1)
+        turns = np.where(win_turns < never, win_turns, -1)
+        last = cards - 1 - np.argmax(turns[:, ::-1], axis=1)
+        # trials in which no card wins
+        won = win_turns[np.arange(len(chunk)), first] < never
+        np.add.at(first_wins, first[won], 1)
+        np.add.at(last_wins, last[won], 1)
+        first_winners[chunk[won]] = first[won]
+        last_winners[chunk[won]] = last[won]
+
+        # sum of the unmarked numbers of every card, the mask of unmarked
+        # cells takes 1 byte per cell
+        unmarked = np.einsum("tcij,cij->tc",
+                             ranks > win_turns[:, :, None, None], bingo_cards)
+        # cards that never win are scored with a last number of 0
+        last_numbers = np.take_along_axis(
+            draws, np.minimum(win_turns, never - 1), axis=1)
+        scores[chunk] = unmarked * np.where(win_turns < never,
+                                            last_numbers, 0)
+    trial_index = np.arange(trials)
+    first_scores = np.where(first_winners >= 0,
+                            scores[trial_index, first_winners], 0)
+    last_scores = np.where(last_winners >= 0,
+                           scores[trial_index, last_winners], 0)
+    return {"first_wins": first_wins / trials, "last_wins": last_wins / trials,
+            "scores": scores, "first_winners": first_winners,
+            "last_winners": last_winners, "first_scores": first_scores,
+            "last_scores": last_scores}
+
+
+def parse(data_raw: str) -> tuple:
+    """
+    Returns the bingo cards as a numpy array of shape (cards, 5, 5) and the
+    numbers drawn as a numpy array.
+    """
     numbers_drawn_raw, _, bingo_cards_raw = data_raw.partition("\n")
-    numbers_drawn = [int(number) for number in numbers_drawn_raw.split(",")]
-    # extract bingo cards as a list containing individual cards as numpy arrays
-    bingo_cards_raw = bingo_cards_raw.splitlines()
-    bingo_cards = []
-    for i in range(0, len(bingo_cards_raw), 6):
-        card = bingo_cards_raw[i + 1: i + 6]
-        card_array = np.array([row.split() for row in card], dtype=int)
-        bingo_cards.append(card_array)
-
-    # play bingo !
-    winning_bingo_cards = play_bingo(bingo_cards, numbers_drawn)
+    numbers_drawn = np.array(numbers_drawn_raw.split(","), dtype=int)
+    bingo_cards = np.array(bingo_cards_raw.split(), dtype=int)
+    return bingo_cards.reshape(-1, 5, 5), numbers_drawn
+
+
+def part1(data: tuple) -> int:
+    """
+    Returns the score of the first winning bingo card.
+    """
+    win_turns, scores = rank_bingo(*data)
+    first, _ = find_winners(win_turns, len(data[1]))
+    return int(scores[first]) if first is not None else 0
+
+
+def part2(data: tuple) -> int:
+    """
+    Returns the score of the last winning bingo card.
+    """
+    win_turns, scores = rank_bingo(*data)
+    _, last = find_winners(win_turns, len(data[1]))
+    return int(scores[last]) if last is not None else 0
+
+
+def main():
+    # get data
+    data = get_input(DAY, YEAR, transform=parse)
 
     # part 1
-    first_winning_bingo_card = winning_bingo_cards[0]
-    part1_answer = score_bingo_card(first_winning_bingo_card)
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    last_winning_bingo_card = winning_bingo_cards[-1]
-    part2_answer = score_bingo_card(last_winning_bingo_card)
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
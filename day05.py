@@ -1,15 +1,23 @@
+import os
+import sys
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from multiprocessing import Pool, shared_memory
 import numpy as np
-from day1 import get_input, submit_answer
+from day01 import get_input, stream_input, submit_answer
 
 DAY, YEAR = 5, 2021
 
 
-def draw_vents(lines: list, shape: tuple,
-               allow_diag: bool = False) -> np.ndarray:
+def draw_vents(lines, shape: tuple, allow_diag: bool = False,
+               chunk_size: int = 2**14) -> np.ndarray:
     """
     Draws vents 0n a grid of '0's, where '1' corresponds to a vent point.
     Each overlapping vent point increments this value by 1, the final value is
     the 'height' of the vent.
+    The points of a chunk of lines are generated together and added to the
+    grid at once, the grid uses the smallest unsigned dtype that cannot
+    overflow.
     """
     """
     |    ---> +ve x axis
@@ -20,36 +28,92 @@ def draw_vents(lines: list, shape: tuple,
     y     0 0 0 0 0
     axis
     """
-    grid = np.full(shape, 0, dtype=int)
-    for line in lines:
-        x0, y0, x1, y1 = line[0][0], line[0][1], line[1][0], line[1][1]
-        grid_new_vent = np.full(shape, 0, dtype=int)
-
+    # lines can be any iterable, eg streamed, if their number is unknown the
+    # heights could reach any value
+    grid = np.zeros(shape, dtype=grid_dtype(
+        len(lines) if hasattr(lines, "__len__") else None))
+    # flat view of the grid to add points to
+    flat_grid = grid.reshape(-1)
+    lines = iter(lines)
+    while chunk := list(islice(lines, chunk_size)):
+        segments = np.array(chunk, dtype=np.int64).reshape(-1, 4)
         # skips diagonal lines if diagonals are not allowed
-        if x0 != x1 and y0 != y1 and not allow_diag:
-            continue
-        # single vent drawn on temporary grid
-        for point in generate_points(line):
-            grid_new_vent[point[1], point[0]] = 1
-        # vent grid combined with the others
-        grid = np.add(grid, grid_new_vent)
+        if not allow_diag:
+            x0, y0, x1, y1 = segments.T
+            segments = segments[(x0 == x1) | (y0 == y1)]
+        add_segments(flat_grid, segments, shape[1])
     return grid
 
 
+def grid_dtype(count: int = None) -> type:
+    """
+    Returns the smallest unsigned dtype that can hold the height of count
+    overlapping vents, any number of vents if count is None.
+    """
+    if count is None:
+        return np.uint32
+    return np.uint8 if count < 2**8 else \
+        np.uint16 if count < 2**16 else np.uint32
+
+
+def add_segments(flat_grid: np.ndarray, segments: np.ndarray,
+                 cols: int) -> None:
+    """
+    Adds all the points of the segments, an array of rows (x0, y0, x1, y1),
+    to the flattened grid in place.
+    Only the points covered by the segments are touched, their counts fit
+    the grid dtype as they cannot exceed the final heights.
+    """
+    indices, counts = np.unique(segment_indices(segments, cols),
+                                return_counts=True)
+    flat_grid[indices] += counts.astype(flat_grid.dtype)
+
+
+def segment_indices(segments: np.ndarray, cols: int) -> np.ndarray:
+    """
+    Returns the flat grid indices of all the points of all the segments,
+    an array of rows (x0, y0, x1, y1), on a grid with cols columns.
+    Consecutive points of a segment are a constant step apart, so the
+    indices are a running total of the steps, restarted at the start of
+    each segment.
+    """
+    if len(segments) == 0:
+        return np.empty(0, dtype=np.int64)
+    x0, y0, x1, y1 = segments.T
+    steps = np.sign(y1 - y0) * cols + np.sign(x1 - x0)
+    lengths = np.maximum(np.abs(x1 - x0), np.abs(y1 - y0)) + 1
+    starts = y0 * cols + x0
+    ends = starts + steps * (lengths - 1)
+    increments = np.repeat(steps, lengths)
+    # jumps from the end of one segment to the start of the next
+    increments[np.cumsum(lengths) - lengths] = starts - np.append(0, ends[:-1])
+    return np.cumsum(increments)
+
+
+def segment_points(segments: np.ndarray) -> tuple:
+    """
+    Returns the x and y coordinates of all the points of all the segments,
+    an array of rows (x0, y0, x1, y1).
+    Every point is the start of its segment plus a number of steps in the
+    direction of the segment, so all points are generated at once.
+    """
+    x0, y0, x1, y1 = segments.T
+    dx, dy = np.sign(x1 - x0), np.sign(y1 - y0)
+    lengths = np.maximum(np.abs(x1 - x0), np.abs(y1 - y0)) + 1
+    segment = np.repeat(np.arange(len(segments)), lengths)
+    # number of steps from the start of its segment of each point
+    steps = np.arange(segment.size) - \
+        np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return x0[segment] + dx[segment] * steps, y0[segment] + dy[segment] * steps
+
+
 def generate_points(line: list) -> list:
     """
     Returns a list of the points contained in the vent described by the line.
     eg. Line: '0, 0 -> 2, 2' returns points: [(0,0), (1,1), (2,2)]
     """
-    x0, y0, x1, y1 = line[0][0], line[0][1], line[1][0], line[1][1]
-    x, y = x0, y0
-    points = [(x0, y0)]
-    # increments (or decrements) each coordinate until they both match
-    while x != x1 or y != y1:
-        x = x + np.sign(x1 - x)
-        y = y + np.sign(y1 - y)
-        points.append((x, y))
-    return points
+    xs, ys = segment_points(np.array(line).reshape(1, 4))
+    return list(zip(xs.tolist(), ys.tolist()))
 
 
 def count_tall_vents(grid: np.ndarray, height: int = 1) -> int:
@@ -57,36 +121,420 @@ def count_tall_vents(grid: np.ndarray, height: int = 1) -> int:
     Returns a count of all the vents above the specified height in the grid.
     The height of a vent point is the numeric value at that point in the grid.
     """
-    heights, counts = np.unique(grid, return_counts=True)
-    return sum([counts[i] for i, h in enumerate(heights) if h > height])
+    return int(np.count_nonzero(grid > height))
 
 
-def main():
-    # get raw data
-    data_raw = get_input(DAY, YEAR, transform="lines")
-    # list containing tuples of tuples of start and end coordinates
-    line_segments = []
-    # determines required size of the array to be created
-    max_x, max_y = 0, 0
-    # processing raw data
-    for line_raw in data_raw:
+# state of each worker process of draw_vents_parallel(), set once by
+# load_band_worker() so that the segments are only sent once per worker
+band_worker = {}
+
+
+def load_band_worker(segments: np.ndarray, shape: tuple, dtype: type,
+                     memory_name: str) -> None:
+    """
+    Stores the segments and attaches the shared grid for the worker
+    process. Used as the pool initializer.
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    band_worker.update(segments=segments, memory=memory,
+                       grid=np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+
+
+def clip_segments(segments: np.ndarray, first_row: int,
+                  last_row: int) -> np.ndarray:
+    """
+    Returns the parts of the segments, an array of rows (x0, y0, x1, y1),
+    within the rows [first_row, last_row) of the grid, with y relative to
+    first_row. Segments outside the rows are dropped.
+    """
+    x0, y0, x1, y1 = segments.T
+    dx, dy = np.sign(x1 - x0), np.sign(y1 - y0)
+    steps = np.maximum(np.abs(x1 - x0), np.abs(y1 - y0))
+    # range of steps from the start of each segment that are within the rows
+    first = np.where(dy > 0, first_row - y0,
+                     np.where(dy < 0, y0 - last_row + 1, 0))
+    last = np.where(dy > 0, last_row - 1 - y0,
+                    np.where(dy < 0, y0 - first_row, steps))
+    first, last = np.maximum(first, 0), np.minimum(last, steps)
+    # horizontal segments are either entirely within the rows or not at all
+    keep = (first <= last) & ((dy != 0) | ((first_row <= y0) &
+                                           (y0 < last_row)))
+    x0, y0, dx, dy = x0[keep], y0[keep], dx[keep], dy[keep]
+    first, last = first[keep], last[keep]
+    return np.stack((x0 + dx * first, y0 + dy * first - first_row,
+                     x0 + dx * last, y0 + dy * last - first_row), axis=1)
+
+
+def render_band(band: tuple) -> int:
+    """
+    Draws the worker's segments clipped to the band of rows
+    (first_row, last_row) onto the shared grid and returns the number of
+    points in the band above the height.
+    """
+    first_row, last_row, height = band
+    grid = band_worker["grid"][first_row:last_row]
+    segments = clip_segments(band_worker["segments"], first_row, last_row)
+    # the rows of a band are contiguous, so this is a view of the shared grid
+    add_segments(grid.reshape(-1), segments, grid.shape[1])
+    return count_tall_vents(grid, height)
+
+
+def draw_vents_parallel(lines, shape: tuple, allow_diag: bool = False,
+                        height: int = 1, workers: int = None,
+                        bands: int = None) -> tuple:
+    """
+    Draws the vents across a pool of processes, each drawing bands of rows
+    of a grid in shared memory, and counts the vents above the height.
+
+    Parameters
+    ----------
+    lines : iterable
+        The vent line segments as tuples of start and end coordinates.
+    shape : tuple
+        Shape of the grid.
+    allow_diag : bool, optional
+        Draws the diagonal vents. The default is False.
+    height : int, optional
+        Vents above this height are counted. The default is 1.
+    workers : int, optional
+        Number of worker processes. The default is None, one per core.
+    bands : int, optional
+        Number of bands of rows. The default is None, 4 per worker.
+
+    Returns
+    -------
+    tuple
+        The grid, identical to the one returned by draw_vents(), and the
+        number of vents above the height, as count_tall_vents().
+
+    """
+    segments = np.array(list(lines), dtype=np.int64).reshape(-1, 4)
+    dtype = grid_dtype(len(segments))
+    if not allow_diag:
+        x0, y0, x1, y1 = segments.T
+        segments = segments[(x0 == x1) | (y0 == y1)]
+    workers = workers or os.cpu_count()
+    bands = max(1, min(bands or 4 * workers, shape[0]))
+    bounds = np.linspace(0, shape[0], bands + 1).astype(int).tolist()
+
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    memory = shared_memory.SharedMemory(create=True, size=max(1, size))
+    shared_grid = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+    try:
+        shared_grid[:] = 0
+        with Pool(workers, initializer=load_band_worker,
+                  initargs=(segments, shape, dtype, memory.name)) as pool:
+            count = sum(pool.map(render_band, [
+                (first_row, last_row, height)
+                for first_row, last_row in zip(bounds[:-1], bounds[1:])]))
+        grid = shared_grid.copy()
+    finally:
+        # the shared memory cannot be closed while the array uses it
+        del shared_grid
+        memory.close()
+        memory.unlink()
+    return grid, count
+
+
+# key: family of parallel vents, value: coefficients (p, q) of the equation
+# p * x + q * y = key of its lines, as returned by point_keys()
+FAMILIES = {"horizontal": (0, 1), "vertical": (1, 0),
+            "diagonal": (1, -1), "antidiagonal": (1, 1)}
+# dense grids larger than this are counted by count_overlaps() instead
+MAX_GRID_SIZE = 2**26
+# dense grids larger than this are drawn by draw_vents_parallel() when more
+# than one core is available
+PARALLEL_GRID_SIZE = 2**22
+
+
+def vent_families(segments: np.ndarray, allow_diag: bool = False) -> dict:
+    """
+    Splits the segments, an array of rows (x0, y0, x1, y1), into families of
+    parallel lines. Each vent is described by the line it lies on (key) and
+    the range [lo, hi] of its position along that line (t):
+    horizontal: key y, t x. vertical: key x, t y.
+    diagonal: key x - y, t x. antidiagonal: key x + y, t x.
+    Returns a dictionary of arrays of rows (key, lo, hi) for each family.
+    """
+    x0, y0, x1, y1 = segments.T
+    horizontal = y0 == y1
+    vertical = (x0 == x1) & ~horizontal
+    diagonal = (x1 - x0 == y1 - y0) & ~horizontal
+    antidiagonal = ~(horizontal | vertical | diagonal)
+    low_x, high_x = np.minimum(x0, x1), np.maximum(x0, x1)
+    families = {
+        "horizontal": (y0, low_x, high_x, horizontal),
+        "vertical": (x0, np.minimum(y0, y1), np.maximum(y0, y1), vertical),
+        "diagonal": (x0 - y0, low_x, high_x, diagonal),
+        "antidiagonal": (x0 + y0, low_x, high_x, antidiagonal)}
+    return {family: np.stack((key[mask], lo[mask], hi[mask]), axis=1)
+            for family, (key, lo, hi, mask) in families.items()
+            if allow_diag or family in ("horizontal", "vertical")}
+
+
+def cover_intervals(vents: np.ndarray) -> tuple:
+    """
+    Sweeps along all the lines of a family at once and returns the disjoint
+    intervals of the points covered by at least one vent and by at least two
+    vents, as arrays of rows (key, lo, hi).
+    Positions are encoded as (key - min key) * B + t, with B large enough
+    that the intervals of different lines never meet.
+    """
+    key, lo, hi = vents.T
+    key_min, t_min = key.min(), lo.min()
+    base = hi.max() - t_min + 2
+    # each vent adds 1 to the cover from its start until after its end
+    positions = np.concatenate(((key - key_min) * base + lo - t_min,
+                                (key - key_min) * base + hi + 1 - t_min))
+    order = np.argsort(positions, kind="stable")
+    positions = positions[order]
+    covers = np.cumsum(np.repeat((1, -1), len(vents))[order])[:-1]
+
+    intervals = []
+    for min_cover in (1, 2):
+        # cover between consecutive positions, empty gaps are skipped
+        keep = (covers >= min_cover) & (positions[1:] > positions[:-1])
+        starts, ends = positions[:-1][keep], positions[1:][keep]
+        # merges intervals that touch
+        if len(starts):
+            new = np.append(True, starts[1:] != ends[:-1])
+            last = np.append(np.flatnonzero(new)[1:] - 1, len(new) - 1)
+            starts, ends = starts[new], ends[last]
+        intervals.append(np.stack((starts // base + key_min,
+                                   starts % base + t_min,
+                                   (ends - 1) % base + t_min), axis=1))
+    return tuple(intervals)
+
+
+def family_points(family: str, key: np.ndarray, t: np.ndarray) -> tuple:
+    """
+    Returns the x and y coordinates of the points at t along the lines key.
+    """
+    if family == "horizontal":
+        return t, key
+    if family == "vertical":
+        return key, t
+    return t, t - key if family == "diagonal" else key - t
+
+
+def point_keys(family: str, x: np.ndarray, y: np.ndarray) -> tuple:
+    """
+    Returns the key and t of the points along the lines of the family.
+    """
+    if family == "horizontal":
+        return y, x
+    if family == "vertical":
+        return x, y
+    return (x - y if family == "diagonal" else x + y), x
+
+
+def key_spans(family: str, intervals: np.ndarray, other: str) -> tuple:
+    """
+    Returns the lines (keys) of the intervals of the family and the range of
+    keys of the other family's lines that each interval spans.
+    """
+    key, lo, hi = intervals.T
+    ends = [point_keys(other, *family_points(family, key, t))[0]
+            for t in (lo, hi)]
+    return key, np.minimum(*ends), np.maximum(*ends)
+
+
+def intersections(family_a: str, intervals_a: np.ndarray, family_b: str,
+                  intervals_b: np.ndarray) -> tuple:
+    """
+    Returns the x and y coordinates of the grid points where the intervals of
+    two families of non-parallel lines cross.
+    With the keys of both families as coordinates, the intervals of family a
+    are rows and those of family b columns. Columns are swept in order,
+    keeping the sorted rows of the intervals of family a that span the
+    current column, so each column only visits the rows it crosses.
+    """
+    rows, first_column, last_column = key_spans(family_a, intervals_a,
+                                                family_b)
+    columns, first_row, last_row = key_spans(family_b, intervals_b, family_a)
+    # events along the columns: rows start (0), columns are crossed (1) and
+    # rows end (2), in that order on the same column as spans are inclusive
+    positions = np.concatenate((first_column, columns, last_column))
+    kinds = np.repeat((0, 1, 2), (len(rows), len(columns), len(rows)))
+    index = np.concatenate((np.arange(len(rows)), np.arange(len(columns)),
+                            np.arange(len(rows))))
+    order = np.lexsort((kinds, positions))
+
+    rows, columns = rows.tolist(), columns.tolist()
+    first_row, last_row = first_row.tolist(), last_row.tolist()
+    active, keys_a, keys_b = [], [], []
+    for kind, i in zip(kinds[order].tolist(), index[order].tolist()):
+        if kind == 0:
+            insort(active, rows[i])
+        elif kind == 2:
+            del active[bisect_left(active, rows[i])]
+        else:
+            crossed = active[bisect_left(active, first_row[i]):
+                             bisect_right(active, last_row[i])]
+            keys_a.extend(crossed)
+            keys_b.extend([columns[i]] * len(crossed))
+
+    # solves the line equations of both families for the crossings, lines
+    # of diagonals only cross on grid points of the same parity
+    keys_a = np.array(keys_a, dtype=np.int64)
+    keys_b = np.array(keys_b, dtype=np.int64)
+    (pa, qa), (pb, qb) = FAMILIES[family_a], FAMILIES[family_b]
+    det = pa * qb - qa * pb
+    x, y = keys_a * qb - keys_b * qa, keys_b * pa - keys_a * pb
+    hit = (x % det == 0) & (y % det == 0)
+    return x[hit] // det, y[hit] // det
+
+
+def in_intervals(intervals: np.ndarray, key: np.ndarray,
+                 t: np.ndarray) -> np.ndarray:
+    """
+    Returns an array of booleans of whether each point (key, t) lies within
+    the disjoint intervals, sorted by key then lo, by binary search.
+    """
+    if len(intervals) == 0:
+        return np.zeros(len(key), dtype=bool)
+    # lexicographic search on (key, t) through a structured view
+    dtype = [("key", np.int64), ("t", np.int64)]
+    starts = np.ascontiguousarray(intervals[:, :2]).view(dtype).ravel()
+    points = np.ascontiguousarray(np.stack((key, t), axis=1)).view(dtype)
+    i = np.searchsorted(starts, points.ravel(), side="right") - 1
+    inside = i >= 0
+    i = np.maximum(i, 0)
+    return inside & (intervals[i, 0] == key) & (intervals[i, 2] >= t)
+
+
+def count_overlaps(line_segments, allow_diag: bool = False) -> int:
+    """
+    Counts the points where at least two vents overlap without drawing them
+    on a grid, so the time and memory used depend on the number of vents
+    rather than the size of the grid.
+
+    Vents are split into families of parallel lines. Overlaps within a
+    family are found by sweeping along its lines, and points shared by
+    different families are where their lines cross. A crossing point is in
+    the overlaps of k families, it is counted once: added if k = 0,
+    otherwise counted k times by the families and k - 1 are removed.
+
+    Parameters
+    ----------
+    line_segments : iterable
+        The vent line segments as tuples of start and end coordinates.
+    allow_diag : bool, optional
+        Includes the diagonal vents. The default is False.
+
+    Returns
+    -------
+    int
+        Number of points where at least two vents overlap.
+
+    """
+    segments = np.array(list(line_segments), dtype=np.int64).reshape(-1, 4)
+    families = {family: cover_intervals(vents) for family, vents in
+                vent_families(segments, allow_diag).items() if len(vents)}
+    total = sum(int(np.sum(overlaps[:, 2] - overlaps[:, 1] + 1))
+                for _, overlaps in families.values())
+
+    # points covered by at least two families
+    names = list(families)
+    xs, ys = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    for i, family_a in enumerate(names):
+        for family_b in names[i + 1:]:
+            x, y = intersections(family_a, families[family_a][0],
+                                 family_b, families[family_b][0])
+            xs.append(x)
+            ys.append(y)
+    points = np.unique(np.stack((np.concatenate(xs), np.concatenate(ys)),
+                                axis=1), axis=0)
+    x, y = points.T
+    # number of families in whose overlaps each crossing point lies
+    k = sum(in_intervals(overlaps, *point_keys(family, x, y)).astype(int)
+            for family, (_, overlaps) in families.items())
+    if isinstance(k, int):
+        return total
+    return total + int(np.count_nonzero(k == 0)) - \
+        int(np.sum(np.maximum(k - 1, 0)))
+
+
+def parse_lines(lines):
+    """
+    Lazily yields each vent line segment as a tuple of tuples of start and
+    end coordinates.
+    """
+    for line_raw in lines:
         coords_raw = line_raw.split(" -> ")
         x0, _, y0 = coords_raw[0].partition(",")
         x1, _, y1 = coords_raw[1].partition(",")
-        x0, y0, x1, y1 = int(x0), int(y0), int(x1), int(y1)
-        line_segments.append(((x0, y0), (x1, y1)))
+        yield (int(x0), int(y0)), (int(x1), int(y1))
+
+
+def grid_shape(line_segments) -> tuple:
+    """
+    Returns the shape of the grid required to contain all the line segments.
+    """
+    # determines required size of the array to be created
+    max_x, max_y = 0, 0
+    for (x0, y0), (x1, y1) in line_segments:
         max_x, max_y = max(max_x, x0, x1), max(max_y, y0, y1)
     # taking into account of 0
-    max_x += 1
-    max_y += 1
+    return max_y + 1, max_x + 1
+
+
+def parse(data_raw: str) -> tuple:
+    """
+    Returns a list of the vent line segments as tuples of start and end
+    coordinates, and the shape of the grid required to contain them.
+    """
+    # list containing tuples of tuples of start and end coordinates
+    line_segments = list(parse_lines(data_raw.splitlines()))
+    return line_segments, grid_shape(line_segments)
+
+
+def count_vents(line_segments, shape: tuple,
+                allow_diag: bool = False) -> int:
+    """
+    Returns the number of points where vents overlap, counted without a grid
+    above MAX_GRID_SIZE, on a grid drawn across processes above
+    PARALLEL_GRID_SIZE and on a grid drawn in this process otherwise.
+    """
+    size = shape[0] * shape[1]
+    if size > MAX_GRID_SIZE:
+        return count_overlaps(line_segments, allow_diag)
+    if size > PARALLEL_GRID_SIZE and (os.cpu_count() or 1) > 1:
+        return draw_vents_parallel(line_segments, shape, allow_diag)[1]
+    return count_tall_vents(draw_vents(line_segments, shape, allow_diag))
+
+
+def part1(data: tuple) -> int:
+    """
+    Returns the number of points where horizontal and vertical vents overlap.
+    """
+    line_segments, shape = data
+    return count_vents(line_segments, shape)
+
+
+def part2(data: tuple) -> int:
+    """
+    Returns the number of points where any vents overlap, diagonals included.
+    """
+    line_segments, shape = data
+    return count_vents(line_segments, shape, allow_diag=True)
+
+
+def main(stream: bool = False):
+    # get data, or stream it from the input file for each pass
+    if stream:
+        shape = grid_shape(parse_lines(stream_input(DAY, YEAR)))
+    else:
+        data = get_input(DAY, YEAR, transform=parse)
 
     # part 1
-    part1_answer = count_tall_vents(draw_vents(line_segments, (max_y, max_x)))
+    part1_answer = part1(
+        (parse_lines(stream_input(DAY, YEAR)), shape) if stream else data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    part2_answer = count_tall_vents(
-        draw_vents(line_segments, (max_y, max_x), allow_diag=True))
+    part2_answer = part2(
+        (parse_lines(stream_input(DAY, YEAR)), shape) if stream else data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
@@ -95,4 +543,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(stream="--stream" in sys.argv)
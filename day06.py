@@ -1,9 +1,12 @@
+import operator
 from collections import Counter
-from day1 import get_input, submit_answer
+import answer_cache
+from day01 import get_input, submit_answer
 
 DAY, YEAR = 6, 2021
 
 
+@answer_cache.cached(DAY, YEAR, params=("days",))
 def simulate_lanternfish(fish_timers: list, days: int) -> int:
     """
     Grows the lanternfish population until the specified day and returns a
@@ -26,16 +29,130 @@ def simulate_lanternfish(fish_timers: list, days: int) -> int:
     return sum(timers)
 
 
+# transition matrix of the timers over one day, timers tomorrow are the
+# product of this matrix and the count of each timer today
+TRANSITION = tuple(
+    tuple(int(today == tomorrow + 1) +
+          int(today == 0 and tomorrow in (6, 8)) for today in range(9))
+    for tomorrow in range(9))
+
+
+def multiply(a: tuple, b: tuple, modulus: int = None) -> tuple:
+    """
+    Returns the product of the matrix a and the matrix, or vector, b.
+    Python ints are used so that the counts are exact, reduced modulo the
+    modulus if one is specified.
+    """
+    columns = list(zip(*b)) if isinstance(b[0], tuple) else [b]
+    product = tuple(tuple(sum(x * y for x, y in zip(row, column))
+                          for column in columns) for row in a)
+    if modulus is not None:
+        product = tuple(tuple(x % modulus for x in row) for row in product)
+    return product if isinstance(b[0], tuple) else \
+        tuple(row[0] for row in product)
+
+
+def transition_powers(count: int, modulus: int = None) -> list:
+    """
+    Returns the transition matrices over 1, 2, 4, ..., 2**(count - 1) days,
+    each computed by squaring the previous one.
+    """
+    powers = [TRANSITION] if count > 0 else []
+    while len(powers) < count:
+        powers.append(multiply(powers[-1], powers[-1], modulus))
+    return powers
+
+
+def as_day_count(days) -> int:
+    """
+    Returns the number of days as an int, numpy integers included, raising
+    a ValueError if it is not a non-negative integer.
+    """
+    try:
+        days = operator.index(days)
+    except TypeError:
+        raise ValueError(f"Number of days must be an integer: {days!r}") \
+            from None
+    if days < 0:
+        raise ValueError(f"Number of days cannot be negative: {days}")
+    return days
+
+
+def count_lanternfish(fish_timers: list, days, modulus: int = None):
+    """
+    Returns the number of lanternfish after the specified number of days,
+    without simulating every day.
+
+    Parameters
+    ----------
+    fish_timers : list
+        The timers of the lanternfish on day 0.
+    days : int or list
+        Number of days, or a list of numbers of days to answer together,
+        which share the squared transition matrices.
+    modulus : int, optional
+        Returns the counts modulo this number, eg a prime, as exact counts
+        over very many days have too many digits. The default is None.
+
+    Returns
+    -------
+    int or list
+        The number of lanternfish after the days, or a list of the number
+        after each of the days.
+
+    """
+    single = not hasattr(days, "__iter__")
+    day_counts = [as_day_count(day_count)
+                  for day_count in ([days] if single else days)]
+    counter = Counter(fish_timers)
+    start = tuple(counter[timer] for timer in range(9))
+    # squarings are only kept for this call, large exact powers would
+    # otherwise hold on to a lot of memory
+    powers = transition_powers(max(day_counts, default=0).bit_length(),
+                               modulus)
+    counts = []
+    for day_count in day_counts:
+        # applies the transition over 2**exponent days for each set bit
+        timers = start
+        for exponent, power in enumerate(powers):
+            if day_count >> exponent & 1:
+                timers = multiply(power, timers, modulus)
+        total = sum(timers)
+        counts.append(total % modulus if modulus is not None else total)
+    return counts[0] if single else counts
+
+
+def parse(data_raw: str) -> list:
+    """
+    Returns the lanternfish timers as a list of ints.
+    """
+    return [int(number) for number in data_raw.split(",")]
+
+
+def part1(data: list) -> int:
+    """
+    Returns the number of lanternfish after 80 days.
+    """
+    return count_lanternfish(data, 80)
+
+
+def part2(data: list) -> int:
+    """
+    Returns the number of lanternfish after 256 days.
+    """
+    return count_lanternfish(data, 256)
+
+
 def main():
     # get data
-    data = [int(number) for number in get_input(DAY, YEAR).split(",")]
+    data = get_input(DAY, YEAR, transform=parse)
 
     # part 1
-    part1_answer = simulate_lanternfish(data, 80)
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    part2_answer = simulate_lanternfish(data, 256)
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
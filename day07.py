@@ -1,8 +1,10 @@
-from day1 import get_input, submit_answer
+import answer_cache
+from day01 import get_input, submit_answer
 
 DAY, YEAR = 7, 2021
 
 
+@answer_cache.cached(DAY, YEAR, params=("constant_rate",))
 def find_optimal_position(positions: list, constant_rate: bool = True) -> list:
     """
     Returns the fuel consumed to align all the crab submarines at the
@@ -26,16 +28,37 @@ def find_optimal_position(positions: list, constant_rate: bool = True) -> list:
     return min(total_fuel_consumption)
 
 
+def parse(data_raw: str) -> list:
+    """
+    Returns the crab submarine positions as a list of ints.
+    """
+    return [int(number) for number in data_raw.split(",")]
+
+
+def part1(data: list) -> int:
+    """
+    Returns the fuel needed to align when each step costs the same.
+    """
+    return find_optimal_position(data)
+
+
+def part2(data: list) -> int:
+    """
+    Returns the fuel needed to align when each step costs 1 more than the last.
+    """
+    return find_optimal_position(data, constant_rate=False)
+
+
 def main():
     # get data
-    data = [int(number) for number in get_input(DAY, YEAR).split(",")]
+    data = get_input(DAY, YEAR, transform=parse)
 
     # part 1
-    part1_answer = find_optimal_position(data)
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    part2_answer = find_optimal_position(data, constant_rate=False)
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
@@ -1,4 +1,5 @@
-from day1 import get_input, submit_answer
+import sys
+from day01 import get_input, stream_input, submit_answer
 
 DAY, YEAR = 8, 2021
 
@@ -21,17 +22,17 @@ def find_digit(segments: str) -> int:
     return digit_segments[len(segments)]
 
 
-def count_unique_digits(data: list) -> int:
+def count_unique_digits(data) -> int:
     """
     Will detect if digits 1,4,7,8 are present in the outputs and
     return a total count of detections.
     'Unique' digits are those with a unique segments length.
     """
-    is_unique = []
+    count = 0
     for line in data:
         for output in line[1].split(" "):
-            is_unique.append(is_unique_digit(output))
-    return sum(is_unique)
+            count += is_unique_digit(output)
+    return count
 
 
 def contains_all(string: str, search: str) -> bool:
@@ -130,7 +131,7 @@ def decode_output(output_raw: str, decoder: dict) -> int:
     return int(output_digits)
 
 
-def sum_all_outputs(data: list) -> int:
+def sum_all_outputs(data) -> int:
     """
     Returns the sum of all the output values
     """
@@ -141,22 +142,50 @@ def sum_all_outputs(data: list) -> int:
     return total
 
 
-def main():
-    # get data
-    data_raw = get_input(DAY, YEAR, transform="lines")
+def parse_lines(lines):
+    """
+    Lazily yields a tuple of the signals and outputs of each display.
+    """
+    for line in lines:
+        signals, _, outputs = line.partition(" | ")
+        yield signals, outputs
+
+
+def parse(data_raw: str) -> list:
+    """
+    Returns a list of the signals and outputs of each display.
+    """
     # data(list) contains each line(tuple) consisting of two tuples:
     # [( (signals: str), (outputs: str) ), ...]
-    data = []
-    for line in data_raw:
-        signals, _, outputs = line.partition(" | ")
-        data.append((signals, outputs))
+    return list(parse_lines(data_raw.splitlines()))
+
+
+def part1(data) -> int:
+    """
+    Returns the number of times the digits 1, 4, 7 or 8 appear in the outputs.
+    """
+    return count_unique_digits(data)
+
+
+def part2(data) -> int:
+    """
+    Returns the sum of all the decoded output values.
+    """
+    return sum_all_outputs(data)
+
+
+def main(stream: bool = False):
+    # get data, or stream it from the input file for each part
+    data = None if stream else get_input(DAY, YEAR, transform=parse)
 
     # part 1
-    part1_answer = count_unique_digits(data)
+    part1_answer = part1(
+        parse_lines(stream_input(DAY, YEAR)) if stream else data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    part2_answer = sum_all_outputs(data)
+    part2_answer = part2(
+        parse_lines(stream_input(DAY, YEAR)) if stream else data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
@@ -165,4 +194,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(stream="--stream" in sys.argv)
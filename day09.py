@@ -1,27 +1,11 @@
 import numpy as np
-from day1 import get_input, submit_answer
+import instrument
+from day01 import get_input, submit_answer
+from grid import load_digit_grid, neighbour_table
 
 DAY, YEAR = 9, 2021
-
-
-def get_neighbours(point: tuple, grid: np.ndarray,
-                   return_coords: bool = False, max_height: int = 10) -> list:
-    """
-    Returns a list containing all the values of the neighbours of a point
-    in a grid.
-    Diagonal neighbours do not count.
-    Returns the coordinates instead of the values if return_coords = True.
-    Only returns neighbours whose values are under the max_height,
-    if specified.
-    """
-    # padding grid to facilitate corner and edge points
-    g = np.pad(grid, 1, mode="constant", constant_values=10)
-    i, j = point
-    coords = ((i, j-1), (i, j+1), (i-1, j), (i+1, j))
-    return [(row, col) for row, col in coords if g[row+1, col+1] < max_height] \
-        if return_coords else \
-        [g[row+1, col+1] for row, col in coords
-         if g[row+1, col+1] < max_height]
+# version of the parsed input cache, bump when load_digit_grid() changes
+PARSE_VERSION = 1
 
 
 def find_local_minima(grid: np.ndarray) -> np.ndarray:
@@ -29,34 +13,42 @@ def find_local_minima(grid: np.ndarray) -> np.ndarray:
     Returns an array of booleans of all minimum values in the grid.
     Diagonal neighbours do not count.
     """
-    rows, columns = grid.shape
-    grid_bools = np.full(grid.shape, -1, dtype=bool)
-    for i in range(rows):
-        for j in range(columns):
-            grid_bools[i, j] = grid[i, j] < min(get_neighbours((i, j), grid))
-    return grid_bools
+    # missing neighbours (-1) index the padding value appended at the end
+    heights = np.append(grid.ravel(), 10)
+    neighbour_heights = heights[neighbour_table(grid.shape)]
+    return (heights[:-1] < neighbour_heights.min(axis=1)).reshape(grid.shape)
 
 
 def sum_risk_level(grid: np.ndarray, grid_bools: np.ndarray) -> int:
     """
     Returns the sum of all the minima risk levels (height +1).
     """
-    return np.sum(grid[grid_bools]) + np.sum(grid_bools)
+    return int(np.sum(grid[grid_bools])) + int(np.sum(grid_bools))
 
 
-def get_basin_neighbours(points: set, grid: np.ndarray):
+def get_basin_neighbours(points: set, grid: np.ndarray,
+                         table: np.ndarray = None) -> set:
     """
-    Recursively finds all neighbours within a basin, starting with the minima.
+    Finds all points within a basin, starting with the minima, by expanding
+    only the points added in the previous step.
+    The depth is the number of steps taken.
+    Pass the neighbour table of the grid when finding several basins.
     """
-    basin_points = points
-    for point in basin_points:
-        basin_points = basin_points | \
-            set(get_neighbours(point, grid, return_coords=True, max_height=9))
-
-    if len(basin_points) > len(points):
-        return get_basin_neighbours(basin_points, grid)
-    else:
-        return basin_points
+    columns = grid.shape[1]
+    heights = grid.ravel()
+    if table is None:
+        table = neighbour_table(grid.shape)
+    basin_points = {i * columns + j for i, j in points}
+    new_points, depth = basin_points, 0
+    while new_points:
+        depth += 1
+        neighbours = table[list(new_points)].ravel()
+        neighbours = neighbours[neighbours >= 0]
+        neighbours = neighbours[heights[neighbours] < 9]
+        new_points = set(neighbours.tolist()) - basin_points
+        basin_points |= new_points
+    instrument.record_max("get_basin_neighbours.depth", depth)
+    return {divmod(n, columns) for n in basin_points}
 
 
 def find_basins(grid: np.ndarray, grid_bools: np.ndarray) -> list:
@@ -67,31 +59,55 @@ def find_basins(grid: np.ndarray, grid_bools: np.ndarray) -> list:
     minima_rows, minima_columns = np.where(grid_bools == True)
     minima_coords = list(zip(minima_rows, minima_columns))
     basins = []
+    table = neighbour_table(grid.shape)
     for point in minima_coords:
-        basin_points = get_basin_neighbours({point}, grid)
+        # minima within an already found basin share that basin
+        for basin_points, _ in basins:
+            if point in basin_points:
+                break
+        else:
+            basin_points = get_basin_neighbours({point}, grid, table)
         basins.append((basin_points, len(basin_points)))
     return sorted(basins, key=lambda x: x[1], reverse=True)
 
 
-def main():
-    # get data
-    data_raw = get_input(DAY, YEAR, transform="lines")
-    data = np.full((len(data_raw), len(data_raw)), 0, dtype="u1")
-    for i, row in enumerate(data_raw):
-        for j, number in enumerate(row):
-            data[i, j] = number
+def parse(data_raw: str) -> np.ndarray:
+    """
+    Returns the heightmap as a numpy array.
+    """
+    return load_digit_grid(data_raw)
 
-    # part 1
+
+def part1(data: np.ndarray) -> int:
+    """
+    Returns the sum of the risk levels of all the low points.
+    """
     minima = find_local_minima(data)
-    part1_answer = sum_risk_level(data, minima)
-    print(f"Part 1 Answer: {part1_answer}")
+    return sum_risk_level(data, minima)
 
-    # part 2
+
+def part2(data: np.ndarray) -> int:
+    """
+    Returns the product of the sizes of the three largest basins.
+    """
+    minima = find_local_minima(data)
     basins = find_basins(data, minima)
     product = 1
     for basin_size in basins[:3]:
         product = product * basin_size[1]
-    part2_answer = product
+    return product
+
+
+def main():
+    # get data
+    data = get_input(DAY, YEAR, transform=parse, cache=True)
+
+    # part 1
+    part1_answer = part1(data)
+    print(f"Part 1 Answer: {part1_answer}")
+
+    # part 2
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
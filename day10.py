@@ -1,4 +1,6 @@
-from day1 import get_input, submit_answer
+import sys
+import instrument
+from day01 import get_input, stream_input, submit_answer
 
 DAY, YEAR = 10, 2021
 
@@ -8,6 +10,7 @@ def remove_chunks(line: str) -> str:
     Removes all empty chunks in each iteration until there are none left.
     Returns the remaining characters.
     """
+    instrument.count("remove_chunks.passes")
     old_length = len(line)
     reduced_line = line.replace("()", "").replace("[]", ""). \
         replace("{}", "").replace("<>", "")
@@ -29,7 +32,7 @@ def is_corrupted(line: str) -> bool:
     return False
 
 
-def score_corrupted_lines(data: list) -> int:
+def score_corrupted_lines(data) -> int:
     """
     Finds the first closing character in corrupted lines and adds its
     corresponding score.
@@ -46,7 +49,7 @@ def score_corrupted_lines(data: list) -> int:
     return score
 
 
-def score_incomplete_lines(data: list) -> int:
+def score_incomplete_lines(data) -> int:
     """
     Finds the closing characters required to complete each lines and
     adds the corresponding score. (Always an odd number of incomplete lines).
@@ -64,21 +67,42 @@ def score_incomplete_lines(data: list) -> int:
     return sorted(score_sum)[len(score_sum) // 2]
 
 
-def main():
-    # get data
-    data = get_input(DAY, YEAR, transform="lines")
+def parse(data_raw: str) -> list:
+    """
+    Returns the list of lines of the navigation subsystem.
+    """
+    return data_raw.splitlines()
+
+
+def part1(data) -> int:
+    """
+    Returns the total syntax error score of the corrupted lines.
+    """
+    return score_corrupted_lines(data)
+
+
+def part2(data) -> int:
+    """
+    Returns the middle completion score of the incomplete lines.
+    """
+    return score_incomplete_lines(data)
+
+
+def main(stream: bool = False):
+    # get data, or stream it from the input file for each pass
+    data = None if stream else get_input(DAY, YEAR, transform=parse)
     # check data for complete lines, code assumes none exist
-    for line in data:
+    for line in stream_input(DAY, YEAR) if stream else data:
         if len(remove_chunks(line)) == 0:
             print("Complete line detected!")
             break
 
     # part 1
-    part1_answer = score_corrupted_lines(data)
+    part1_answer = part1(stream_input(DAY, YEAR) if stream else data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    part2_answer = score_incomplete_lines(data)
+    part2_answer = part2(stream_input(DAY, YEAR) if stream else data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
@@ -87,4 +111,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(stream="--stream" in sys.argv)
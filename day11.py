@@ -1,53 +1,49 @@
 import numpy as np
-from day1 import get_input, submit_answer
+import instrument
+import answer_cache
+from day01 import get_input, submit_answer
+from grid import load_digit_grid, neighbour_table
 
 DAY, YEAR = 11, 2021
+# version of the parsed input cache, bump when load_digit_grid() changes
+PARSE_VERSION = 1
 
 
-def update_neighbours(grid: np.ndarray, point: tuple) -> np.ndarray:
-    """
-    Returns an updated array where the energy levels of all neighbours of the
-    point are incremented if they have not already flashed this cycle.
-    """
-    # padding to facilitate corners and edges
-    g = np.pad(grid, 1, mode="constant", constant_values=100)
-    # to account for padding
-    row, col = point[0] + 1, point[1] + 1
-    # increments all neighbours energy levels unless they have already flashed
-    for i in (row-1, row, row+1):
-        for j in (col-1, col, col+1):
-            if g[i, j] != 0:
-                g[i, j] += 1
-    # sets energy level of point that flashed
-    g[row, col] = 0
-    # doesn't return padding
-    return g[1: -1, 1: -1]
-
-
-def update_energy_levels(grid: np.ndarray, flash_count: int = 0) -> tuple:
+def update_energy_levels(grid: np.ndarray, flash_count: int = 0,
+                         table: np.ndarray = None) -> tuple:
     """
     Returns an updated array of energy levels that have been incremented and
     flashes have been accounted for.
     Also returns the total number of flashes that occured.
+    All octopuses over 9 flash at once, repeated until no more flash, the
+    depth is the number of waves of flashes.
+    Pass the diagonal neighbour table of the grid when updating repeatedly.
     """
-    rows, cols = grid.shape
-    g = grid.copy()
-    new_flashes = 0
+    g = grid.copy().reshape(-1)
+    if table is None:
+        table = neighbour_table(grid.shape, diagonal=True)
     # only increments energy levels once
     if flash_count == 0:
         g += 1
-    for i in range(rows):
-        for j in range(cols):
-            if g[i, j] > 9:
-                new_flashes += 1
-                g = update_neighbours(g, (i, j))
-    new_flash_count = flash_count + new_flashes
-    # must re-check all values in case flashing caused chain reaction
-    if new_flashes > 0:
-        return update_energy_levels(g, flash_count=new_flash_count)
-    return (g, new_flash_count)
-
-
+    depth = 1
+    flashing = np.flatnonzero(g > 9)
+    while len(flashing) > 0:
+        flash_count += len(flashing)
+        # sets energy level of octopuses that flashed
+        g[flashing] = 0
+        neighbours = table[flashing].ravel()
+        increments = np.bincount(neighbours[neighbours >= 0],
+                                 minlength=len(g)).astype(g.dtype)
+        # increments all neighbours energy levels unless they have already
+        # flashed
+        g += increments * (g != 0)
+        flashing = np.flatnonzero(g > 9)
+        depth += 1
+    instrument.record_max("update_energy_levels.depth", depth)
+    return (g.reshape(grid.shape), flash_count)
+
+
+@answer_cache.cached(DAY, YEAR, params=("steps",))
 def count_flashes(data: np.ndarray, steps: int) -> int:
     """
     Returns the total of number of flashes that occured after the specified
@@ -55,13 +51,15 @@ def count_flashes(data: np.ndarray, steps: int) -> int:
     """
     step, count = 0, 0
     grid = data.copy()
+    table = neighbour_table(grid.shape, diagonal=True)
     while step < steps:
-        grid, flash_count = update_energy_levels(grid)
+        grid, flash_count = update_energy_levels(grid, table=table)
         count += flash_count
         step += 1
     return count
 
 
+@answer_cache.cached(DAY, YEAR, params=("max_steps",))
 def find_giga_flash(data: np.ndarray, max_steps: int = 1000) -> int:
     """
     Returns the number of steps (cycles) it took for all octopuses to flash
@@ -69,8 +67,9 @@ def find_giga_flash(data: np.ndarray, max_steps: int = 1000) -> int:
     """
     grid = data.copy()
     grid_giga_flash = np.full(grid.shape, 0)
+    table = neighbour_table(grid.shape, diagonal=True)
     for step in range(1, max_steps):
-        grid = update_energy_levels(grid)[0]
+        grid = update_energy_levels(grid, table=table)[0]
         # checks if all octopuses flashed
         if np.array_equal(grid, grid_giga_flash):
             return step
@@ -78,20 +77,37 @@ def find_giga_flash(data: np.ndarray, max_steps: int = 1000) -> int:
     return None
 
 
+def parse(data_raw: str) -> np.ndarray:
+    """
+    Returns the energy levels as a numpy array.
+    """
+    return load_digit_grid(data_raw)
+
+
+def part1(data: np.ndarray) -> int:
+    """
+    Returns the number of flashes after 100 steps.
+    """
+    return count_flashes(data, 100)
+
+
+def part2(data: np.ndarray) -> int:
+    """
+    Returns the first step on which all octopuses flash.
+    """
+    return find_giga_flash(data)
+
+
 def main():
     # get data
-    data_raw = get_input(DAY, YEAR, transform="lines")
-    data = np.full((len(data_raw), len(data_raw)), 0, dtype="u1")
-    for i, row in enumerate(data_raw):
-        for j, number in enumerate(row):
-            data[i, j] = number
+    data = get_input(DAY, YEAR, transform=parse, cache=True)
 
     # part 1
-    part1_answer = count_flashes(data, 100)
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    part2_answer = find_giga_flash(data)
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
@@ -1,4 +1,5 @@
-from day1 import get_input, submit_answer
+import instrument
+from day01 import get_input, submit_answer
 
 DAY, YEAR = 12, 2021
 
@@ -46,6 +47,8 @@ def find_paths(cave_map: dict, paths: list = (["start"],),
     repeat visits are allowed.
     """
     new_paths = []
+    # number of new paths created
+    materialized = 0
     for path in paths:
         # skip path if it has already ended
         if path[-1] == "end":
@@ -58,25 +61,49 @@ def find_paths(cave_map: dict, paths: list = (["start"],),
                     (not repeat or visited_small_twice(cave_map, path)):
                 continue
             new_paths.append(path + [destination])
+            materialized += 1
+    instrument.count("find_paths.paths", materialized)
     if len(new_paths) == len(paths):
         return new_paths
     return find_paths(cave_map, paths=new_paths, repeat=repeat)
 
 
-def main():
-    # get data
-    data_raw = get_input(DAY, YEAR, transform="lines")
+def parse(data_raw: str) -> list:
+    """
+    Returns a list of the connections between caves as tuples.
+    """
     data = []
-    for connection in data_raw:
+    for connection in data_raw.splitlines():
         data.append(tuple(connection.split("-")))
+    return data
 
-    # part 1
+
+def part1(data: list) -> int:
+    """
+    Returns the number of paths that visit small caves at most once.
+    """
     cave_map = create_cave_map(data)
-    part1_answer = len(find_paths(cave_map))
+    return len(find_paths(cave_map))
+
+
+def part2(data: list) -> int:
+    """
+    Returns the number of paths that visit a single small cave at most twice.
+    """
+    cave_map = create_cave_map(data)
+    return len(find_paths(cave_map, repeat=True))
+
+
+def main():
+    # get data
+    data = get_input(DAY, YEAR, transform=parse)
+
+    # part 1
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    part2_answer = len(find_paths(cave_map, repeat=True))
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
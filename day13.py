@@ -1,5 +1,5 @@
 import numpy as np
-from day1 import get_input, submit_answer
+from day01 import get_input, submit_answer
 
 DAY, YEAR = 13, 2021
 
@@ -49,20 +49,29 @@ def get_activation_code(paper: np.ndarray, instructions: tuple) -> np.ndarray:
     grid = paper.copy()
     for instruction in instructions:
         grid = fold_paper(grid, instruction)
-    # converts the numpy array into a more readable form
+    print(render_paper(grid))
+    return grid
+
+
+def render_paper(paper: np.ndarray) -> str:
+    """
+    Returns the paper converted from a numpy array into a more readable form.
+    """
     code = ""
-    for row in range(grid.shape[0]):
+    for row in range(paper.shape[0]):
         code_row = ""
-        for x in np.nditer(grid[row, :]):
+        for x in np.nditer(paper[row, :]):
             code_row += str(x)
         code += code_row + "\n"
-    print(code.replace("0", ".").replace("1", "@"))
-    return grid
+    return code.replace("0", ".").replace("1", "@")
 
 
-def main():
-    # get data
-    data_raw = get_input(DAY, YEAR, transform="lines")
+def parse(data_raw: str) -> tuple:
+    """
+    Returns a tuple of the points as (row, column) and a tuple of the fold
+    instructions as (axis, index).
+    """
+    data_raw = data_raw.splitlines()
     points_raw = data_raw[:data_raw.index("")]
     instructions_raw = data_raw[data_raw.index("") + 1:]
     # tuple containing each point's indices as (row, column)
@@ -82,13 +91,40 @@ def main():
         instruction = tuple(instruction)
         instructions.append(instruction)
     instructions = tuple(instructions)
+    return points, instructions
 
-    # part 1
+
+def part1(data: tuple) -> int:
+    """
+    Returns the number of dots visible after the first fold.
+    """
+    points, instructions = data
     paper = generate_paper(points)
-    part1_answer = np.sum(fold_paper(paper, instructions[0]))
+    return np.sum(fold_paper(paper, instructions[0]))
+
+
+def part2(data: tuple) -> str:
+    """
+    Returns the activation code drawn on the paper after all the folds.
+    """
+    points, instructions = data
+    grid = generate_paper(points)
+    for instruction in instructions:
+        grid = fold_paper(grid, instruction)
+    return render_paper(grid)
+
+
+def main():
+    # get data
+    data = get_input(DAY, YEAR, transform=parse)
+    points, instructions = data
+
+    # part 1
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
+    paper = generate_paper(points)
     code = get_activation_code(paper, instructions)
     part2_answer = "HECRZKPR"
     print(f"Part 2 Answer: {part2_answer}")
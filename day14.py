@@ -1,5 +1,6 @@
 import itertools as it
-from day1 import get_input, submit_answer
+import answer_cache
+from day01 import get_input, submit_answer
 
 
 DAY, YEAR = 14, 2021
@@ -20,6 +21,7 @@ def generate_fresh_dicts(template: str, insertion_rules: list) -> tuple:
     return pairs, duplicates
 
 
+@answer_cache.cached(DAY, YEAR, params=("steps",))
 def polymerize(template: str, insertion_rules: list, steps: int) -> tuple:
     """
     Executes the insertion rules to insert new letters in between each pair.
@@ -66,24 +68,48 @@ def get_answer(pairs: dict, duplicates: dict) -> int:
     return max(letters_count.values()) - min(letters_count.values())
 
 
-def main():
-    # get data
-    data_raw = get_input(DAY, YEAR, transform="lines")
+def parse(data_raw: str) -> tuple:
+    """
+    Returns the polymer template and a dictionary of the insertion rules.
+    """
+    data_raw = data_raw.splitlines()
     template = data_raw[:data_raw.index("")][0]
     insertion_rules_raw = data_raw[data_raw.index("")+1:]
     insertion_rules = {}
     for rule in insertion_rules_raw:
         pair, insert = rule.split(" -> ")
         insertion_rules[pair] = insert
+    return template, insertion_rules
+
+
+def part1(data: tuple) -> int:
+    """
+    Returns the difference between the most and least common elements
+    after 10 steps.
+    """
+    polymer_10 = polymerize(*data, 10)
+    return get_answer(*polymer_10)
+
+
+def part2(data: tuple) -> int:
+    """
+    Returns the difference between the most and least common elements
+    after 40 steps.
+    """
+    polymer_40 = polymerize(*data, 40)
+    return get_answer(*polymer_40)
+
+
+def main():
+    # get data
+    data = get_input(DAY, YEAR, transform=parse)
 
     # part 1
-    polymer_10 = polymerize(template, insertion_rules, 10)
-    part1_answer = get_answer(*polymer_10)
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}")
 
     # part 2
-    polymer_40 = polymerize(template, insertion_rules, 40)
-    part2_answer = get_answer(*polymer_40)
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}")
 
     # submit answers
@@ -1,12 +1,16 @@
-import itertools as it
+import sys
 from time import time
 from heapq import heapify, heappush, heappop
 import numpy as np
-import pygame
-from day1 import get_input, submit_answer
+import instrument
+import answer_cache
+from day01 import get_input, submit_answer
+from grid import load_digit_grid, neighbour_lists, neighbour_table
 
 
 DAY, YEAR = 15, 2021
+# version of the parsed input cache, bump when load_digit_grid() changes
+PARSE_VERSION = 1
 
 BLACK = (0, 0, 0)
 GREY = (127, 127, 127)
@@ -18,8 +22,28 @@ YELLOW = (255, 255, 0)
 CYAN = (0, 255, 255)
 MAGENTA = (255, 0, 255)
 
+# pygame is only imported once something is visualised, see load_pygame()
+pygame = None
 
-def draw_grid(window: pygame.Surface, grid_shape: tuple) -> None:
+# template to procedurally generate larger grid
+TEMPLATE = np.array([[0, 1, 2, 3, 4],
+                     [1, 2, 3, 4, 5],
+                     [2, 3, 4, 5, 6],
+                     [3, 4, 5, 6, 7],
+                     [4, 5, 6, 7, 8]])
+
+
+def load_pygame() -> None:
+    """
+    Imports pygame the first time it is needed, so that solving without
+    visualising never pays for importing it.
+    """
+    global pygame
+    if pygame is None:
+        import pygame
+
+
+def draw_grid(window: "pygame.Surface", grid_shape: tuple) -> None:
     """
     Draws lines on the window to create a grid specified by grid_shape.
     """
@@ -43,6 +67,7 @@ def visualise(grid: np.ndarray, start_position: tuple,
     Visualises the A* algorithm as it seeks the shortest path from the
     start_position to the end_position on a grid.
     """
+    load_pygame()
     pygame.init()
     rows, cols = grid.shape
     # create window of at least 400 x 400 pixels, up to 1000x 1000 pixels
@@ -88,16 +113,18 @@ def visualise(grid: np.ndarray, start_position: tuple,
     pygame.quit()
 
 
-def get_neighbours(point: tuple, shape: tuple) -> list:
+def get_neighbours(point: tuple, shape: tuple,
+                   neighbours: list = None) -> list:
     """
     Returns the coordinates (numpy array indices) of neighbours of 
     the given point.
+    Pass the neighbour lists of the grid when looking up several points.
     """
+    if neighbours is None:
+        neighbours = neighbour_lists(shape)
     row, col = point
-    shape_r, shape_c = shape
-    return tuple((row + i, col + j)
-                 for i, j in ((0, -1), (0, 1), (-1, 0), (1, 0))
-                 if ((0 <= row+i < shape_r) and (0 <= col+j < shape_c)))
+    return tuple(divmod(n, shape[1])
+                 for n in neighbours[row * shape[1] + col])
 
 
 def manhattan(u: tuple, v: tuple) -> int:
@@ -165,7 +192,7 @@ class Node:
             node = node.parent
 
 
-def visual_astar(window: pygame.Surface, grid: np.ndarray,
+def visual_astar(window: "pygame.Surface", grid: np.ndarray,
                  start_position: tuple, end_position: tuple) -> int:
     """
     Executes the A* algorithm to find the shortest path between the start and 
@@ -183,6 +210,7 @@ def visual_astar(window: pygame.Surface, grid: np.ndarray,
     start.f = start.g = start.h = end.f = end.g = end.h = 0
     # add start node to the queue
     heappush(queue, start)
+    neighbours = neighbour_lists(shape)
     # set containing all barriers on the grid
     barriers = set()
     for i in range(shape[0]):
@@ -220,7 +248,8 @@ def visual_astar(window: pygame.Surface, grid: np.ndarray,
             return parent.g
 
         # create children nodes
-        for child_position in get_neighbours(parent.position, shape):
+        for child_position in get_neighbours(parent.position, shape,
+                                             neighbours):
             # create child node
             child = Node(child_position, parent)
             # skip if child is a barrier
@@ -230,7 +259,7 @@ def visual_astar(window: pygame.Surface, grid: np.ndarray,
             if child in closed:
                 continue
             # using manhattan metric as heuristic
-            child.g = parent.g + grid[child.position]
+            child.g = parent.g + int(grid[child.position])
             child.h = manhattan(child.position, end.position)
             child.f = child.g + child.h
             # skip if child in queue with larger distance to start
@@ -277,59 +306,96 @@ def create_mega_grid(grid: np.ndarray, template: np.ndarray) -> np.ndarray:
     return mega_grid
 
 
+@answer_cache.cached(DAY, YEAR, params=("start_position", "end_position"))
 def fast_dijkstra(grid: np.ndarray, start_position: tuple,
                   end_position: tuple) -> int:
     """
     Dijkstra algorithm optimised for speed. Returns the shortest path length
     between the start and end nodes.
     """
-    # grid shape
-    grid_r, grid_c = grid.shape
-    queue, closed = [], set()
+    # positions are flat indices into the grid from here on
+    cols = grid.shape[1]
+    start = start_position[0] * cols + start_position[1]
+    end = end_position[0] * cols + end_position[1]
+    # indexing bytes and memoryviews returns python ints, so compact grid
+    # dtypes cannot overflow the path cost, risk levels take one byte per
+    # point when they fit
+    if grid.size and grid.min() >= 0 and grid.max() <= 255:
+        risk_levels = grid.astype(np.uint8).tobytes()
+    else:
+        risk_levels = grid.ravel().tolist()
+    # compact table, row k of the flat view holds the neighbours of point k
+    neighbours = memoryview(neighbour_table(grid.shape).reshape(-1))
+    closed = bytearray(grid.size)
+    queue = []
     # priority queue
     heapify(queue)
-    heappush(queue, (0, start_position))
+    heappush(queue, (0, start))
+    # counted locally for instrumentation, pushes are derived from pops
+    pops, revisits = 0, 0
 
     while len(queue) > 0:
         # get node with lowest g value
         cost, position = heappop(queue)
+        pops += 1
         # stop if end node found
-        if position == end_position:
-            return cost
+        if position == end:
+            break
         # skip if node already in closed set
-        if position in closed:
+        if closed[position]:
+            revisits += 1
             continue
         # add node to the closed set
-        closed.add(position)
-        # get all neighbours of the node
-        row, col = position
-        neighbours = \
-            [(row+i, col+j) for i, j in ((0, 1), (1, 0), (-1, 0), (0, -1))
-             if (0 <= row+i < grid_r and 0 <= col+j < grid_c)]
-
-        for neighbour in neighbours:
-            # skip if neighbouring node in closed set
-            if neighbour in closed:
+        closed[position] = 1
+        for neighbour in neighbours[4 * position:4 * position + 4]:
+            # skip missing neighbours and neighbouring nodes in closed set
+            if neighbour < 0 or closed[neighbour]:
                 continue
             # add neighbouring node to the queue
-            heappush(queue, (cost + grid[neighbour], neighbour))
+            heappush(queue, (cost + risk_levels[neighbour], neighbour))
+    # no path found
+    else:
+        cost = None
+
+    if instrument.ENABLED:
+        instrument.count("fast_dijkstra.pops", pops)
+        instrument.count("fast_dijkstra.pushes", pops + len(queue))
+        instrument.count("fast_dijkstra.revisits", revisits)
+    return cost
+
+
+def parse(data_raw: str) -> np.ndarray:
+    """
+    Returns the risk levels as a numpy array.
+    """
+    return load_digit_grid(data_raw)
+
+
+def part1(data: np.ndarray) -> int:
+    """
+    Returns the lowest total risk of any path from the top left to the
+    bottom right of the grid.
+    """
+    rows, cols = data.shape
+    return fast_dijkstra(data, (0, 0), (rows - 1, cols - 1))
+
+
+def part2(data: np.ndarray) -> int:
+    """
+    Returns the lowest total risk of any path from the top left to the
+    bottom right of the mega grid.
+    """
+    with instrument.timer("create_mega_grid"):
+        mega_grid = create_mega_grid(data, TEMPLATE)
+    rows, cols = mega_grid.shape
+    return fast_dijkstra(mega_grid, (0, 0), (rows - 1, cols - 1))
 
 
-def main():
+def main(headless: bool = False):
     # get data
-    data_raw = get_input(DAY, YEAR, transform="lines")
-    rows, cols = len(data_raw), len(data_raw[0])
-    data = np.full((rows, cols), 0)
-    for i, j in it.product(range(rows), range(cols)):
-        data[i, j] = data_raw[i][j]
-    # template to procedurally generate larger grid
-    template = np.array([[0, 1, 2, 3, 4],
-                         [1, 2, 3, 4, 5],
-                         [2, 3, 4, 5, 6],
-                         [3, 4, 5, 6, 7],
-                         [4, 5, 6, 7, 8]])
+    data = get_input(DAY, YEAR, transform=parse, cache=True)
     # create larger grid
-    mega_grid = create_mega_grid(data, template)
+    mega_grid = create_mega_grid(data, TEMPLATE)
 
     # visualise A* on the grid (uncomment to run)
     # visualise(data, (0, 0), (99,  99))
@@ -337,27 +403,29 @@ def main():
     # visualise A* on the mega grid (uncomment to run)
     # visualise(mega_grid, (0,0), (499, 499))
 
-    # create grid with barriers, may not be solvable if unlucky
-    grid = np.full(data.shape, 1)
-    grid = np.random.randint(0, high=10, size=(100, 100))
-    grid[0, 0], grid[99, 99] = 1, 1
-    grid[grid == 0] = -1
-    grid[:80, 20] = -1
-    grid[20:, 50] = -1
-    grid[20, 50:70] = -1
+    # headless runs never initialise pygame
+    if not headless:
+        # create grid with barriers, may not be solvable if unlucky
+        grid = np.full(data.shape, 1)
+        grid = np.random.randint(0, high=10, size=(100, 100))
+        grid[0, 0], grid[99, 99] = 1, 1
+        grid[grid == 0] = -1
+        grid[:80, 20] = -1
+        grid[20:, 50] = -1
+        grid[20, 50:70] = -1
 
-    # visualise A* on grid with barriers
-    visualise(grid, (0, 0), (99, 99))
+        # visualise A* on grid with barriers
+        visualise(grid, (0, 0), (99, 99))
 
     # part 1
     start_time = time()
-    part1_answer = fast_dijkstra(data, (0, 0), (99, 99))
+    part1_answer = part1(data)
     print(f"Part 1 Answer: {part1_answer}.",
           f"Time Elapsed: {time() - start_time:.3f}")
 
     # part
     start_time = time()
-    part2_answer = fast_dijkstra(mega_grid, (0, 0), (499, 499))
+    part2_answer = part2(data)
     print(f"Part 2 Answer: {part2_answer}.",
           f"Time Elapsed: {time() - start_time:.3f}")
 
@@ -367,4 +435,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(headless="--headless" in sys.argv)
@@ -0,0 +1,246 @@
+import string
+import numpy as np
+
+# segments lit for each digit on a seven segment display
+DIGIT_SEGMENTS = ("abcefg", "cf", "acdeg", "acdfg", "bcdf",
+                  "abdfg", "abdefg", "acf", "abcdefg", "abcdfg")
+
+
+def generate_day01(size: int, seed: int = None) -> str:
+    """
+    Returns a sonar sweep of the specified number of depth readings.
+    """
+    rng = np.random.default_rng(seed)
+    depths = 100 + np.cumsum(rng.integers(-10, 20, size=size))
+    return "\n".join(map(str, np.abs(depths).tolist()))
+
+
+def generate_day02(size: int, seed: int = None) -> str:
+    """
+    Returns a course of the specified number of instructions.
+    """
+    rng = np.random.default_rng(seed)
+    directions = np.array(["forward", "down", "up"])[
+        rng.choice(3, size=size, p=(0.4, 0.35, 0.25))]
+    distances = rng.integers(1, 10, size=size).astype(str)
+    return "\n".join(np.char.add(np.char.add(directions, " "), distances))
+
+
+def generate_day03(size: int, seed: int = None, width: int = None) -> str:
+    """
+    Returns a diagnostic report of up to the specified number of rows, all
+    unique. The width defaults to enough bits to leave room for the rows.
+    """
+    rng = np.random.default_rng(seed)
+    if width is None:
+        width = max(12, int(np.ceil(np.log2(size))) + 2)
+    rows = np.unique(rng.integers(0, 2, size=(size, width), dtype="u1"),
+                     axis=0)
+    rng.shuffle(rows)
+    return "\n".join("".join(map(str, row)) for row in rows.tolist())
+
+
+def generate_day04(size: int, seed: int = None, numbers: int = 100) -> str:
+    """
+    Returns the numbers drawn and the specified number of bingo cards.
+    All numbers are drawn so every card eventually wins.
+    """
+    rng = np.random.default_rng(seed)
+    numbers_drawn = rng.permutation(numbers)
+    # each card contains 25 unique numbers
+    cards = np.argsort(rng.random((size, numbers)), axis=1)[:, :25]
+    lines = [",".join(map(str, numbers_drawn.tolist()))]
+    for card in cards.reshape(size, 5, 5).tolist():
+        lines.append("")
+        lines.extend(" ".join(f"{n:>2}" for n in row) for row in card)
+    return "\n".join(lines)
+
+
+def generate_day05(size: int, seed: int = None, extent: int = 1000) -> str:
+    """
+    Returns the specified number of horizontal, vertical and diagonal vent
+    line segments on a grid of extent x extent.
+    """
+    rng = np.random.default_rng(seed)
+    x0, y0 = rng.integers(0, extent, size=(2, size))
+    length = rng.integers(0, extent, size=size)
+    # 0: horizontal, 1: vertical, 2: diagonal
+    kind = rng.integers(0, 3, size=size)
+    dx = np.where(kind == 1, 0, rng.choice((-1, 1), size=size))
+    dy = np.where(kind == 0, 0, rng.choice((-1, 1), size=size))
+    # shortens each segment so that it stays on the grid
+    limit_x = np.where(dx > 0, extent - 1 - x0, x0)
+    limit_y = np.where(dy > 0, extent - 1 - y0, y0)
+    length = np.minimum(length, np.where(dx != 0, limit_x, extent))
+    length = np.minimum(length, np.where(dy != 0, limit_y, extent))
+    x1, y1 = x0 + dx * length, y0 + dy * length
+    return "\n".join(f"{a},{b} -> {c},{d}" for a, b, c, d in
+                     zip(x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist()))
+
+
+def generate_day06(size: int, seed: int = None) -> str:
+    """
+    Returns the timers of the specified number of lanternfish.
+    """
+    rng = np.random.default_rng(seed)
+    return ",".join(map(str, rng.integers(1, 6, size=size).tolist()))
+
+
+def generate_day07(size: int, seed: int = None, extent: int = 2000) -> str:
+    """
+    Returns the positions of the specified number of crab submarines.
+    """
+    rng = np.random.default_rng(seed)
+    return ",".join(map(str, rng.integers(0, extent, size=size).tolist()))
+
+
+def generate_day08(size: int, seed: int = None) -> str:
+    """
+    Returns the specified number of displays, each with its segments wired
+    up randomly.
+    """
+    rng = np.random.default_rng(seed)
+    lines = []
+    for _ in range(size):
+        wiring = dict(zip("abcdefg", rng.permutation(list("abcdefg"))))
+        scrambled = ["".join(rng.permutation([wiring[s] for s in segments]))
+                     for segments in DIGIT_SEGMENTS]
+        signals = " ".join(rng.permutation(scrambled))
+        outputs = " ".join(scrambled[digit]
+                           for digit in rng.integers(0, 10, size=4))
+        lines.append(f"{signals} | {outputs}")
+    return "\n".join(lines)
+
+
+def generate_digit_grid(rows: int, cols: int, seed: int = None,
+                        low: int = 0) -> str:
+    """
+    Returns a grid of random digits between low and 9.
+    """
+    rng = np.random.default_rng(seed)
+    digits = rng.integers(low, 10, size=(rows, cols), dtype="u1") + ord("0")
+    newlines = np.full((rows, 1), ord("\n"), dtype="u1")
+    return np.hstack((digits, newlines)).tobytes().decode().rstrip("\n")
+
+
+def generate_day09(size: int, seed: int = None) -> str:
+    """
+    Returns a size x size heightmap.
+    """
+    return generate_digit_grid(size, size, seed)
+
+
+def generate_day10(size: int, seed: int = None, length: int = 100) -> str:
+    """
+    Returns the specified number of lines of chunks, roughly length
+    characters long, that are either corrupted or incomplete.
+    There is always an odd number of incomplete lines.
+    """
+    rng = np.random.default_rng(seed)
+    pairs = {"(": ")", "[": "]", "{": "}", "<": ">"}
+    openers = tuple(pairs)
+    corrupted = rng.random(size) < 0.5
+    # the middle score of the incomplete lines needs an odd number of them
+    if (size - corrupted.sum()) % 2 == 0:
+        corrupted[0] = not corrupted[0]
+    lines = []
+    for is_corrupted in corrupted:
+        line, stack = [], []
+        # open a chunk or close the last one with equal probability
+        for opening in rng.random(length) < 0.5:
+            if opening or not stack:
+                stack.append(openers[rng.integers(0, 4)])
+                line.append(stack[-1])
+            else:
+                line.append(pairs[stack.pop()])
+        if is_corrupted:
+            if not stack:
+                stack.append("(")
+                line.append("(")
+            # any closing character except the expected one
+            expected = pairs[stack[-1]]
+            line.append(rng.choice([c for c in ")]}>" if c != expected]))
+            line.extend(pairs[c] for c in reversed(stack))
+        elif not stack:
+            line.append(openers[rng.integers(0, 4)])
+        lines.append("".join(line))
+    return "\n".join(lines)
+
+
+def generate_day11(size: int, seed: int = None) -> str:
+    """
+    Returns a size x size grid of octopus energy levels.
+    """
+    return generate_digit_grid(size, size, seed)
+
+
+def generate_day12(size: int, seed: int = None) -> str:
+    """
+    Returns the connections of a cave system with the specified number of
+    small caves. Big caves are never connected to each other, otherwise
+    there would be infinitely many paths.
+    """
+    rng = np.random.default_rng(seed)
+    small_caves = [f"s{i}" for i in range(size)]
+    big_caves = [f"B{i}" for i in range(max(1, size // 4))]
+    caves = small_caves + big_caves
+    connections = set()
+    for cave in ("start", "end"):
+        for other in rng.choice(caves, size=2, replace=False):
+            connections.add((cave, str(other)))
+    for small_cave in small_caves:
+        for other in rng.choice(caves, size=2, replace=False):
+            if other != small_cave:
+                connections.add(tuple(sorted((small_cave, str(other)))))
+    return "\n".join(f"{a}-{b}" for a, b in sorted(connections))
+
+
+def generate_day13(size: int, seed: int = None, folds: int = 6) -> str:
+    """
+    Returns the specified number of dots on transparent paper along with
+    instructions that fold the paper in half folds times along each axis.
+    """
+    rng = np.random.default_rng(seed)
+    extent = 5 * 2 ** folds - 1
+    x, y = rng.integers(0, extent, size=(2, size))
+    # dots never appear on a fold line
+    fold_lines = [(extent + 1) // 2 ** (i + 1) - 1 for i in range(folds)]
+    on_fold = np.isin(x, fold_lines) | np.isin(y, fold_lines)
+    x, y = x[~on_fold], y[~on_fold]
+    # pins the paper size so that every fold is exactly in half
+    lines = [f"{extent - 1},{extent - 1}"]
+    lines.extend(f"{a},{b}" for a, b in zip(x.tolist(), y.tolist()))
+    lines.append("")
+    for fold_line in fold_lines:
+        lines.append(f"fold along x={fold_line}")
+        lines.append(f"fold along y={fold_line}")
+    return "\n".join(lines)
+
+
+def generate_day14(size: int, seed: int = None, elements: int = 10) -> str:
+    """
+    Returns a polymer template of the specified length and an insertion
+    rule for every pair of elements.
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.array(list(string.ascii_uppercase[:elements]))
+    lines = ["".join(rng.choice(letters, size=size)), ""]
+    for a in letters:
+        for b in letters:
+            lines.append(f"{a}{b} -> {rng.choice(letters)}")
+    return "\n".join(lines)
+
+
+def generate_day15(size: int, seed: int = None) -> str:
+    """
+    Returns a size x size grid of risk levels between 1 and 9.
+    """
+    return generate_digit_grid(size, size, seed, low=1)
+
+
+# key: day, value: function that generates an input of the given size
+GENERATORS = {1: generate_day01, 2: generate_day02, 3: generate_day03,
+              4: generate_day04, 5: generate_day05, 6: generate_day06,
+              7: generate_day07, 8: generate_day08, 9: generate_day09,
+              10: generate_day10, 11: generate_day11, 12: generate_day12,
+              13: generate_day13, 14: generate_day14, 15: generate_day15}
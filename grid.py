@@ -0,0 +1,83 @@
+import numpy as np
+
+# (row, column) offsets of the neighbours of a point, in the order used by
+# the neighbour tables
+ORTHOGONAL = ((0, -1), (0, 1), (-1, 0), (1, 0))
+DIAGONAL = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def load_digit_grid(data_raw: str) -> np.ndarray:
+    """
+    Returns a grid of single digits as a numpy array of uint8, parsed in one
+    vectorized pass over the raw input bytes.
+    Grids do not need to be square, but all rows must be the same length.
+
+    Parameters
+    ----------
+    data_raw : str
+        Raw input data with one row of digits per line.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (rows, columns) containing the digits.
+
+    """
+    data = data_raw.strip().replace("\r\n", "\n").encode()
+    cols = data.find(b"\n")
+    # single row grids have no line breaks
+    if cols == -1:
+        cols = len(data)
+    # every row is followed by a line break except the last one
+    rows, remainder = divmod(len(data) + 1, cols + 1)
+    if remainder != 0:
+        raise ValueError("All rows of the grid must be the same length")
+    buffer = np.frombuffer(data + b"\n", dtype="u1").reshape(rows, cols + 1)
+    # drops the line breaks and converts the ascii codes into digits
+    return buffer[:, :cols] - ord("0")
+
+
+def neighbour_table(shape: tuple, diagonal: bool = False) -> np.ndarray:
+    """
+    Returns a table of the flat indices of the neighbours of every point in
+    a grid of the given shape.
+    Tables are not cached, as they grow with the grid, callers that need one
+    repeatedly build it once and pass it on.
+    Points on the edges have fewer neighbours, the missing ones are -1.
+    Indexing a flattened grid with an extra value appended (eg a padding
+    value) therefore returns that value for the missing neighbours.
+
+    Parameters
+    ----------
+    shape : tuple
+        Shape of the grid, (rows, columns).
+    diagonal : bool, optional
+        Includes the 4 diagonal neighbours. The default is False.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only array of shape (rows * columns, 4 or 8), row k contains the
+        neighbours of the point with flat index k.
+
+    """
+    rows, cols = shape
+    offsets = ORTHOGONAL + DIAGONAL if diagonal else ORTHOGONAL
+    dtype = np.int32 if rows * cols < 2**31 else np.int64
+    row, col = np.divmod(np.arange(rows * cols, dtype=dtype), cols)
+    table = np.empty((rows * cols, len(offsets)), dtype=dtype)
+    for k, (i, j) in enumerate(offsets):
+        valid = (0 <= row + i) & (row + i < rows) & \
+            (0 <= col + j) & (col + j < cols)
+        table[:, k] = np.where(valid, (row + i) * cols + col + j, -1)
+    table.flags.writeable = False
+    return table
+
+
+def neighbour_lists(shape: tuple, diagonal: bool = False) -> list:
+    """
+    Returns the neighbour table as a list of lists without the missing
+    neighbours, for loops over individual points in pure Python.
+    """
+    return [[n for n in row if n >= 0]
+            for row in neighbour_table(shape, diagonal).tolist()]
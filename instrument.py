@@ -0,0 +1,96 @@
+import json
+from time import perf_counter
+from contextlib import contextmanager
+from collections import Counter, defaultdict
+
+# instrumentation is opt-in, every function below returns immediately
+# while it is disabled
+ENABLED = False
+
+# key: name, value: running total
+counters = Counter()
+# key: name, value: largest value recorded, eg recursion depth
+maxima = {}
+# key: name, value: total wall time in seconds
+timers = defaultdict(float)
+
+
+def enable(enabled: bool = True) -> None:
+    """
+    Turns instrumentation on, or off if enabled=False.
+    """
+    global ENABLED
+    ENABLED = enabled
+
+
+def reset() -> None:
+    """
+    Clears all the counters, maxima and timers.
+    """
+    counters.clear()
+    maxima.clear()
+    timers.clear()
+
+
+def count(name: str, n: int = 1) -> None:
+    """
+    Adds n to the named counter.
+    Hot loops should count locally and call this once when they finish.
+    """
+    if ENABLED:
+        counters[name] += n
+
+
+def record_max(name: str, value) -> None:
+    """
+    Keeps the largest value recorded under the name.
+    """
+    if ENABLED and value > maxima.get(name, value - 1):
+        maxima[name] = value
+
+
+@contextmanager
+def timer(name: str):
+    """
+    Context manager that adds the wall time of its block to the named timer.
+    """
+    if not ENABLED:
+        yield
+        return
+    start_time = perf_counter()
+    try:
+        yield
+    finally:
+        timers[name] += perf_counter() - start_time
+
+
+def report() -> dict:
+    """
+    Returns a copy of all the counters, maxima and timers.
+    """
+    return {"counters": dict(counters), "maxima": dict(maxima),
+            "timers": dict(timers)}
+
+
+def merge_reports(report_a: dict, report_b: dict) -> dict:
+    """
+    Returns the combination of two reports: counters and timers are added
+    and the largest of the maxima are kept.
+    """
+    merged = {"counters": Counter(report_a["counters"]),
+              "maxima": dict(report_a["maxima"]),
+              "timers": defaultdict(float, report_a["timers"])}
+    merged["counters"].update(report_b["counters"])
+    for name, value in report_b["maxima"].items():
+        merged["maxima"][name] = max(value, merged["maxima"].get(name, value))
+    for name, value in report_b["timers"].items():
+        merged["timers"][name] += value
+    return {key: dict(value) for key, value in merged.items()}
+
+
+def save_json(filename: str, reports: dict) -> None:
+    """
+    Writes the reports, eg one per day as returned by report(), to a json file.
+    """
+    with open(filename, "w") as f:
+        json.dump(reports, f, indent=2, default=int)
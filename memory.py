@@ -0,0 +1,77 @@
+import sys
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # not available on windows, peak_rss() returns None there
+    resource = None
+
+# memory profiling is opt-in as tracing every allocation slows solvers down,
+# measure() returns immediately while it is disabled
+ENABLED = False
+
+# key: phase name, value: bytes allocated at the peak of the phase, bytes
+# still allocated at its end and the peak rss of the process so far
+phases = {}
+
+
+def enable(enabled: bool = True) -> None:
+    """
+    Turns memory profiling on, or off if enabled=False, starting or stopping
+    the tracing of allocations.
+    """
+    global ENABLED
+    ENABLED = enabled
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def reset() -> None:
+    """
+    Clears the measurements of all phases.
+    """
+    phases.clear()
+
+
+def peak_rss() -> int:
+    """
+    Returns the peak resident set size of the process in bytes, or None if
+    the platform cannot report it.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macos, kilobytes everywhere else
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@contextmanager
+def measure(name: str):
+    """
+    Context manager that records the memory allocated by its block under
+    the phase name. Allocations are counted from the start of the block, so
+    memory allocated by earlier phases is not included.
+    """
+    if not ENABLED:
+        yield
+        return
+    tracemalloc.reset_peak()
+    start_size = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        size, peak = tracemalloc.get_traced_memory()
+        phases[name] = {"peak": peak - start_size,
+                        "retained": size - start_size,
+                        "rss": peak_rss()}
+
+
+def report() -> dict:
+    """
+    Returns a copy of the measurements of all phases.
+    """
+    return {name: dict(values) for name, values in phases.items()}
@@ -0,0 +1,268 @@
+import os
+import glob
+import argparse
+import importlib
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+import memory
+import instrument
+import answer_cache
+from day01 import get_input
+
+PARTS = (1, 2)
+
+
+def discover_days(directory: str = None) -> list:
+    """
+    Returns a sorted list of the names of all the day modules (dayNN.py) in
+    the directory, by default the directory containing this file.
+    """
+    if directory is None:
+        directory = os.path.dirname(os.path.abspath(__file__))
+    filenames = glob.glob(os.path.join(directory, "day[0-9][0-9].py"))
+    return sorted(os.path.basename(f)[:-3] for f in filenames)
+
+
+def run_day(module_name: str, parts: tuple = PARTS,
+            instrumented: bool = False, cache_answers: bool = False,
+            profile_memory: bool = False) -> dict:
+    """
+    Imports the day module, then loads and parses its input and solves each
+    of the specified parts, timing every phase. Errors are recorded against
+    the part that raised them, an error while parsing against every part.
+
+    Parameters
+    ----------
+    module_name : str
+        Name of the day module, eg 'day01'.
+    parts : tuple, optional
+        The parts to solve. The default is (1, 2).
+    instrumented : bool, optional
+        Enables the instrumentation counters and timers while solving.
+        The default is False.
+    cache_answers : bool, optional
+        Enables the persistent answer cache while solving.
+        The default is False.
+    profile_memory : bool, optional
+        Records the memory allocated by each phase, which slows every
+        phase down. The default is False.
+
+    Returns
+    -------
+    dict
+        The day, the answer to each part, the error of each part that
+        failed and the wall time in seconds of each phase ('parse',
+        'part1', 'part2') that succeeded. Also the instrumentation
+        report if instrumented=True and the memory report if
+        profile_memory=True.
+
+    """
+    module = importlib.import_module(module_name)
+    timings, answers, errors = {}, {}, {}
+    instrument.enable(instrumented)
+    instrument.reset()
+    answer_cache.enable(cache_answers)
+    memory.enable(profile_memory)
+    memory.reset()
+
+    start_time = perf_counter()
+    try:
+        with memory.measure("parse"):
+            data = get_input(module.DAY, module.YEAR,
+                             transform=module.parse, cache=True)
+        timings["parse"] = perf_counter() - start_time
+    except Exception as e:
+        # no part can be solved without the input
+        errors = {part: repr(e) for part in parts}
+        parts = ()
+
+    for part in parts:
+        solver = getattr(module, f"part{part}")
+        start_time = perf_counter()
+        try:
+            with memory.measure(f"part{part}"):
+                answers[part] = solver(data)
+        except Exception as e:
+            errors[part] = repr(e)
+            continue
+        timings[f"part{part}"] = perf_counter() - start_time
+
+    result = {"day": module.DAY, "answers": answers, "errors": errors,
+              "timings": timings}
+    if instrumented:
+        result["instrument"] = instrument.report()
+    if profile_memory:
+        result["memory"] = memory.report()
+        memory.enable(False)
+    return result
+
+
+def run_all(module_names: list, workers: int = None,
+            split_parts: bool = False, instrumented: bool = False,
+            cache_answers: bool = False, profile_memory: bool = False) -> list:
+    """
+    Runs all the days across a pool of processes and returns their results,
+    sorted by day. Parts that raise an error are reported with the error
+    instead of an answer, the other parts of the day are unaffected.
+
+    Parameters
+    ----------
+    module_names : list
+        Names of the day modules to run.
+    workers : int, optional
+        Number of worker processes. The default is None, one per core.
+    split_parts : bool, optional
+        Solves part 1 and part 2 of each day as separate tasks, which
+        parses the input once per part. The default is False.
+    instrumented : bool, optional
+        Enables the instrumentation in every task. The default is False.
+    cache_answers : bool, optional
+        Enables the answer cache in every task. The default is False.
+    profile_memory : bool, optional
+        Enables memory profiling in every task. Every task then runs in a
+        new worker process, so that the peak rss of a worker is that of a
+        single task. The default is False.
+
+    Returns
+    -------
+    list
+        A list of the results of each day as returned by run_day().
+
+    """
+    tasks = [(name, (part,)) for name in module_names for part in PARTS] \
+        if split_parts else [(name, PARTS) for name in module_names]
+
+    results = {}
+    # the peak rss of a process never decreases, so workers are not reused
+    # while profiling memory
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=(
+            1 if profile_memory else None)) as executor:
+        futures = [(name, parts, executor.submit(run_day, name, parts,
+                                                 instrumented, cache_answers,
+                                                 profile_memory))
+                   for name, parts in tasks]
+        for name, parts, future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                # eg the module failed to import, only this task's parts
+                # are affected
+                result = {"day": int(name[3:]), "answers": {},
+                          "errors": {part: repr(e) for part in parts},
+                          "timings": {}}
+                # same keys as a result, so that it merges like one
+                if instrumented:
+                    result["instrument"] = {"counters": {}, "maxima": {},
+                                            "timers": {}}
+                if profile_memory:
+                    result["memory"] = {}
+            # merges the parts of a day that were solved separately, the
+            # parse time reported is from the first part's task
+            if name in results:
+                results[name]["answers"].update(result["answers"])
+                results[name]["errors"].update(result["errors"])
+                for phase, timing in result["timings"].items():
+                    results[name]["timings"].setdefault(phase, timing)
+                if profile_memory:
+                    for phase, usage in result["memory"].items():
+                        results[name]["memory"].setdefault(phase, usage)
+                if instrumented:
+                    results[name]["instrument"] = instrument.merge_reports(
+                        results[name]["instrument"], result["instrument"])
+            else:
+                results[name] = result
+    return sorted(results.values(), key=lambda x: x["day"])
+
+
+def format_table(results: list) -> str:
+    """
+    Returns a table of the parse, part 1 and part 2 wall times of each day,
+    followed by the errors of any parts that failed.
+    """
+    phases = ("parse", "part1", "part2")
+    header = f"{'Day':>4}" + "".join(f"{phase + ' (s)':>13}"
+                                     for phase in phases + ("total",))
+    rows = [header, "-" * len(header)]
+    for result in results:
+        timings = result["timings"]
+        row = f"{result['day']:>4}"
+        for phase in phases:
+            row += f"{timings[phase]:>13.4f}" if phase in timings \
+                else f"{'-':>13}"
+        row += f"{sum(timings.values()):>13.4f}"
+        for part, error in sorted(result["errors"].items()):
+            row += f"   part {part}: {error}"
+        rows.append(row)
+    return "\n".join(rows)
+
+
+def format_memory_table(results: list) -> str:
+    """
+    Returns a table of the peak memory allocated by the parse, part 1 and
+    part 2 phases of each day, and the peak rss of the worker process that
+    solved the day, in MiB.
+    """
+    phases = ("parse", "part1", "part2")
+    header = f"{'Day':>4}" + "".join(f"{phase + ' (MiB)':>14}"
+                                     for phase in phases + ("rss",))
+    rows = [header, "-" * len(header)]
+    for result in results:
+        if "memory" not in result:
+            continue
+        usage = result["memory"]
+        row = f"{result['day']:>4}"
+        for phase in phases:
+            row += f"{usage[phase]['peak'] / 2**20:>14.2f}" \
+                if phase in usage else f"{'-':>14}"
+        rss = [values["rss"] for values in usage.values()
+               if values["rss"] is not None]
+        row += f"{max(rss) / 2**20:>14.2f}" if rss else f"{'-':>14}"
+        rows.append(row)
+    return "\n".join(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solves all the days in parallel and times each part.")
+    parser.add_argument("days", nargs="*", type=int,
+                        help="days to run, all days by default")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of worker processes")
+    parser.add_argument("-s", "--split-parts", action="store_true",
+                        help="solve part 1 and part 2 as separate tasks")
+    parser.add_argument("-i", "--instrument", metavar="FILENAME",
+                        help="write instrumentation counters to a json file")
+    parser.add_argument("-a", "--answer-cache", action="store_true",
+                        help="reuse answers cached by previous runs")
+    parser.add_argument("-m", "--memory", action="store_true",
+                        help="report the peak memory of each phase, "
+                             "slows every phase down")
+    args = parser.parse_args()
+
+    module_names = discover_days()
+    if args.days:
+        module_names = [name for name in module_names
+                        if int(name[3:]) in args.days]
+
+    results = run_all(module_names, workers=args.workers,
+                      split_parts=args.split_parts,
+                      instrumented=args.instrument is not None,
+                      cache_answers=args.answer_cache,
+                      profile_memory=args.memory)
+    for result in results:
+        for part, answer in sorted(result["answers"].items()):
+            print(f"Day {result['day']:02d} Part {part} Answer: {answer}")
+    print()
+    print(format_table(results))
+    if args.memory:
+        print()
+        print(format_memory_table(results))
+
+    if args.instrument is not None:
+        instrument.save_json(args.instrument,
+                             {f"day{result['day']:02d}": result["instrument"]
+                              for result in results if "instrument" in result})
+
+
+if __name__ == "__main__":
+    main()
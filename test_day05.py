@@ -0,0 +1,83 @@
+import numpy as np
+import day05
+
+# coordinates of the vents, the dense grid would have 10**14 points
+EXTENT = 10**7
+
+
+def random_segments(count: int, size: int, seed: int = 0) -> list:
+    """
+    Returns random horizontal, vertical and diagonal vents within a grid of
+    size x size points.
+    """
+    rng = np.random.default_rng(seed)
+    segments = []
+    for _ in range(count):
+        x0, y0 = rng.integers(0, size, 2).tolist()
+        dx, dy = [(1, 0), (0, 1), (1, 1), (1, -1)][rng.integers(4)]
+        steps = int(rng.integers(0, size))
+        steps = min([steps] + [size - 1 - x0] * (dx == 1) +
+                    [size - 1 - y0] * (dy == 1) + [y0] * (dy == -1))
+        segments.append(((x0, y0), (x0 + dx * steps, y0 + dy * steps)))
+    return segments
+
+
+def test_count_overlaps_matches_dense_grid():
+    segments = random_segments(200, 50)
+    for allow_diag in (False, True):
+        grid = day05.draw_vents(segments, (50, 50), allow_diag)
+        assert day05.count_overlaps(segments, allow_diag) == \
+            day05.count_tall_vents(grid)
+
+
+def test_parts_above_max_grid_size():
+    segments = random_segments(200, 50, seed=1)
+    # translating the vents keeps their overlaps but not the grid size
+    far = [((x0 + EXTENT, y0 + EXTENT), (x1 + EXTENT, y1 + EXTENT))
+           for (x0, y0), (x1, y1) in segments]
+    shape = day05.grid_shape(far)
+    assert shape[0] * shape[1] > day05.MAX_GRID_SIZE
+    assert day05.part1((far, shape)) == day05.part1(
+        (segments, day05.grid_shape(segments)))
+    assert day05.part2((far, shape)) == day05.part2(
+        (segments, day05.grid_shape(segments)))
+
+
+def test_draw_vents_parallel_matches_draw_vents():
+    segments = random_segments(300, 60, seed=2)
+    for allow_diag in (False, True):
+        grid = day05.draw_vents(segments, (60, 60), allow_diag)
+        parallel_grid, count = day05.draw_vents_parallel(
+            segments, (60, 60), allow_diag, workers=2, bands=7)
+        assert parallel_grid.dtype == grid.dtype
+        assert np.array_equal(parallel_grid, grid)
+        assert count == day05.count_tall_vents(grid)
+
+
+def test_parts_above_parallel_grid_size(monkeypatch):
+    segments = random_segments(300, 60, seed=3)
+    shape = day05.grid_shape(segments)
+    expected = day05.part1((segments, shape)), day05.part2((segments, shape))
+    draw, calls = day05.draw_vents_parallel, []
+
+    def draw_vents_parallel(*args, **kwargs):
+        calls.append(args)
+        return draw(*args, **kwargs)
+
+    monkeypatch.setattr(day05, "PARALLEL_GRID_SIZE", 0)
+    monkeypatch.setattr(day05.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(day05, "draw_vents_parallel", draw_vents_parallel)
+    assert (day05.part1((segments, shape)),
+            day05.part2((segments, shape))) == expected
+    assert len(calls) == 2
+
+
+def test_count_overlaps_long_vents():
+    segments = [((0, 0), (EXTENT, EXTENT)), ((0, EXTENT), (EXTENT, 0)),
+                ((0, 5), (EXTENT, 5)), ((EXTENT - 10, 5), (EXTENT + 5, 5)),
+                # crosses the diagonal between grid points only
+                ((0, EXTENT - 1), (EXTENT - 1, 0))]
+    # 11 points shared by the horizontals, (5, 5) with the diagonal and the
+    # centre of the diagonals
+    assert day05.count_overlaps(segments) == 11
+    assert day05.count_overlaps(segments, allow_diag=True) == 13